@@ -0,0 +1,47 @@
+"""Composite indexes for hot list/filter queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_salary_slips_employee_period", "salary_slips", ["employee_id", "year", "month"]),
+    ("ix_salary_slips_status_period", "salary_slips", ["status", "year", "month"]),
+    ("ix_expenses_employee_created", "expenses", ["employee_id", "created_at"]),
+    ("ix_expenses_status_created", "expenses", ["status", "created_at"]),
+    ("ix_notifications_user_unread_created", "notifications", ["user_id", "is_read", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction and does not
+        # block writes, so large tables stay online while the indexes build.
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,43 @@
+"""Per-user unread notification counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    counters = op.create_table(
+        "notification_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # Backfill from existing notifications.
+    notifications = sa.table("notifications", sa.column("user_id"), sa.column("is_read", sa.Boolean))
+    op.execute(
+        counters.insert().from_select(
+            ["user_id", "unread_count"],
+            sa.select(notifications.c.user_id, sa.func.count())
+            .where(notifications.c.is_read == sa.false())
+            .group_by(notifications.c.user_id),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_counters")
@@ -0,0 +1,73 @@
+"""Employee search index (SQLite FTS5 trigram table / Postgres pg_trgm)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite: an external-content FTS5 table over users, kept in sync by triggers.
+# Note that batch (table-recreating) migrations of users drop these triggers,
+# so such migrations must recreate them.
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE users_search USING fts5("
+    "full_name, email, content='users', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER users_search_ai AFTER INSERT ON users BEGIN "
+    "INSERT INTO users_search (rowid, full_name, email) VALUES (new.id, new.full_name, new.email); "
+    "END",
+    "CREATE TRIGGER users_search_ad AFTER DELETE ON users BEGIN "
+    "INSERT INTO users_search (users_search, rowid, full_name, email) "
+    "VALUES ('delete', old.id, old.full_name, old.email); "
+    "END",
+    "CREATE TRIGGER users_search_au AFTER UPDATE OF full_name, email ON users BEGIN "
+    "INSERT INTO users_search (users_search, rowid, full_name, email) "
+    "VALUES ('delete', old.id, old.full_name, old.email); "
+    "INSERT INTO users_search (rowid, full_name, email) VALUES (new.id, new.full_name, new.email); "
+    "END",
+    "INSERT INTO users_search (users_search) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS users_search_au",
+    "DROP TRIGGER IF EXISTS users_search_ad",
+    "DROP TRIGGER IF EXISTS users_search_ai",
+    "DROP TABLE IF EXISTS users_search",
+]
+
+# Postgres: a trigram GIN index on the same expression the search queries use;
+# the index itself is maintained by Postgres, so no triggers are needed.
+POSTGRES_INDEX = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_search_trgm ON users "
+    "USING gin ((lower(full_name || ' ' || email)) gin_trgm_ops)"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            op.execute(POSTGRES_INDEX)
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_search_trgm")
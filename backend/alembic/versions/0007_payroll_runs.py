@@ -0,0 +1,45 @@
+"""Payroll runs
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payroll_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("department", sa.String(), nullable=True),
+        sa.Column("rules", sa.JSON(), nullable=False),
+        sa.Column("slip_count", sa.Integer(), nullable=False),
+        sa.Column("skipped_count", sa.Integer(), nullable=False),
+        sa.Column("total_gross", sa.Float(), nullable=False),
+        sa.Column("total_deductions", sa.Float(), nullable=False),
+        sa.Column("total_tax", sa.Float(), nullable=False),
+        sa.Column("total_net", sa.Float(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_payroll_runs_id", "payroll_runs", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payroll_runs_id", table_name="payroll_runs")
+    op.drop_table("payroll_runs")
@@ -0,0 +1,60 @@
+"""Payroll monthly aggregates
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    aggregates = op.create_table(
+        "payroll_monthly_aggregates",
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("department", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("slip_count", sa.Integer(), nullable=False),
+        sa.Column("total_net_salary", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("year", "month", "department", "status"),
+    )
+
+    # Backfill from existing salary slips.
+    slips = sa.table(
+        "salary_slips",
+        sa.column("id"), sa.column("employee_id"), sa.column("year"), sa.column("month"),
+        sa.column("status"), sa.column("net_salary"),
+    )
+    users = sa.table("users", sa.column("id"), sa.column("department"))
+    department = sa.func.coalesce(users.c.department, "")
+    status = sa.func.coalesce(slips.c.status, "pending")
+    op.execute(
+        aggregates.insert().from_select(
+            ["year", "month", "department", "status", "slip_count", "total_net_salary"],
+            sa.select(
+                slips.c.year,
+                slips.c.month,
+                department,
+                status,
+                sa.func.count(slips.c.id),
+                sa.func.coalesce(sa.func.sum(slips.c.net_salary), 0.0),
+            )
+            .select_from(slips.join(users, users.c.id == slips.c.employee_id))
+            .group_by(slips.c.year, slips.c.month, department, status),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("payroll_monthly_aggregates")
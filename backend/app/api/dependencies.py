@@ -1,17 +1,35 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.cache import principal_cache
+from app.core.database import get_async_db
 from app.core.security import decode_token
+from app.services.notification_service import redeem_stream_ticket
 from app.models.user import User, UserRole
 from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+def _cache_user(user: User):
+    principal_cache.set_user(user.id, {key: getattr(user, key) for key in USER_COLUMNS})
+
+
+def _attach_cached_user(db: AsyncSession, values: dict) -> User:
+    """Rebuild a cached user as a persistent instance of this session without a SELECT."""
+    user = User(**values)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get the current authenticated user."""
     credentials_exception = HTTPException(
@@ -20,19 +38,50 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_token(token)
+    payload = principal_cache.get_token(token)
     if payload is None:
-        raise credentials_exception
+        payload = decode_token(token)
+        if payload is None:
+            raise credentials_exception
+        principal_cache.set_token(token, payload)
     
     email: str = payload.get("sub")
     if email is None:
         raise credentials_exception
     
     token_data = TokenData(email=email)
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user_id = payload.get("user_id")
+    cached = principal_cache.get_user(user_id) if user_id is not None else None
+    if cached is not None and cached["email"] == token_data.email:
+        user = _attach_cached_user(db, cached)
+    else:
+        user = await db.scalar(select(User).where(User.email == token_data.email))
+        if user is None:
+            raise credentials_exception
+        _cache_user(user)
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
     
+    return user
+
+
+async def get_current_user_for_stream(
+    ticket: str = Query(...),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get the current user from a single-use stream ticket (EventSource cannot send headers)."""
+    user_id = await redeem_stream_ticket(db, ticket)
+    await db.commit()
+    user = await db.get(User, user_id) if user_id is not None else None
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired stream ticket"
+        )
     
     if not user.is_active:
         raise HTTPException(
@@ -1,71 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import func, and_, or_, select, case
 from typing import List, Optional
+from pathlib import Path
 from datetime import datetime, date
-from app.core.database import get_db
+from app.core.cache import principal_cache, response_cache
+from app.core.database import get_async_db
+from app.core.serialization import model_response, response_columns, rows_response
 from app.api.dependencies import get_current_active_admin
 from app.models.user import User
 from app.models.salary_slip import SalarySlip
 from app.models.expense import Expense, ExpenseStatus
 from app.models.notification import Notification, NotificationType
-from app.schemas.salary_slip import SalarySlipCreate, SalarySlipUpdate, SalarySlipResponse
+from app.models.payroll_aggregate import PayrollMonthlyAggregate
+from app.models.payroll_run import PayrollRun
+from app.schemas.salary_slip import (
+    SalarySlipCreate, SalarySlipUpdate, SalarySlipResponse, BulkSalarySlipResult, SalarySlipImportResult
+)
 from app.schemas.expense import ExpenseResponse, ExpenseApproval
 from app.schemas.dashboard import DashboardStats
-from app.schemas.user import UserResponse
-from app.services.pdf_service import generate_salary_slip_pdf
+from app.schemas.payroll_run import PayrollRunCreate, PayrollRunResponse
+from app.schemas.user import UserResponse, EmployeeSearchResponse
+from app.services.employee_search import employee_search_filter, search_employees
+from app.services.pdf_cache import get_salary_slip_pdf, pdf_cache
+from app.services.pdf_export import export_filters, stream_salary_slips_zip
+from app.services.payroll_import import IMPORT_FORMATS, error_report_path, import_salary_slips
+from app.services.payroll_register import stream_payroll_register
+from app.services.notification_hub import notification_hub
 from app.services.notification_service import create_notification
+from app.services.payroll_engine import run_payroll
+from app.services.payroll_aggregate_service import PayrollAggregateDeltas, apply_payroll_aggregate_deltas
+from app.services.salary_slip_service import bulk_insert_salary_slips, net_salary, refresh_derived_tax, taxable_pay
+from app.services.tax_engine import TaxTableNotFound, monthly_tax
+from app.utils.loading import embed_employees, include_query
+from app.utils.pagination import keyset_paginate, set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/dashboard/stats", response_model=DashboardStats)
+@response_cache.cached(tags=["users", "salary_slips", "expenses"])
 async def get_dashboard_stats(
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get admin dashboard statistics."""
+    now = datetime.now()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    current_month = now.month
+    current_year = now.year
+    last_month = current_month - 1 if current_month > 1 else 12
+    last_month_year = current_year if current_month > 1 else current_year - 1
+    
     # Total employees
-    total_employees = db.query(User).filter(User.role == "employee").count()
-    last_month_employees = db.query(User).filter(
-        User.role == "employee",
-        User.created_at < datetime.now().replace(day=1)
-    ).count()
+    total_employees, last_month_employees = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((User.created_at < month_start, 1), else_=0)), 0)
+        ).where(User.role == "employee")
+    )).one()
     employees_trend = ((total_employees - last_month_employees) / last_month_employees * 100) if last_month_employees > 0 else 0
     
-    # Total salary disbursed this month
-    current_month = datetime.now().month
-    current_year = datetime.now().year
-    total_salary = db.query(func.sum(SalarySlip.net_salary)).filter(
-        SalarySlip.month == current_month,
-        SalarySlip.year == current_year,
-        SalarySlip.status == "paid"
-    ).scalar() or 0.0
-    
-    last_month_salary = db.query(func.sum(SalarySlip.net_salary)).filter(
-        SalarySlip.month == (current_month - 1) if current_month > 1 else 12,
-        SalarySlip.year == (current_year if current_month > 1 else current_year - 1),
-        SalarySlip.status == "paid"
-    ).scalar() or 0.0
-    salary_trend = ((total_salary - last_month_salary) / last_month_salary * 100) if last_month_salary > 0 else 0
-    
     # Pending expenses
-    pending_expenses = db.query(Expense).filter(Expense.status == ExpenseStatus.PENDING).count()
-    last_month_pending = db.query(Expense).filter(
-        Expense.status == ExpenseStatus.PENDING,
-        Expense.created_at < datetime.now().replace(day=1)
-    ).count()
+    pending_expenses, last_month_pending = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((Expense.created_at < month_start, 1), else_=0)), 0)
+        ).where(Expense.status == ExpenseStatus.PENDING)
+    )).one()
     expenses_trend = ((pending_expenses - last_month_pending) / last_month_pending * 100) if last_month_pending > 0 else 0
     
+    # Paid payroll per month for this year and last month, from the aggregate table
+    paid_by_period = {
+        (year, month): float(total or 0.0)
+        for year, month, total in (await db.execute(
+            select(
+                PayrollMonthlyAggregate.year,
+                PayrollMonthlyAggregate.month,
+                func.sum(PayrollMonthlyAggregate.total_net_salary)
+            ).where(
+                PayrollMonthlyAggregate.status == "paid",
+                or_(
+                    PayrollMonthlyAggregate.year == current_year,
+                    and_(
+                        PayrollMonthlyAggregate.year == last_month_year,
+                        PayrollMonthlyAggregate.month == last_month
+                    )
+                )
+            ).group_by(PayrollMonthlyAggregate.year, PayrollMonthlyAggregate.month)
+        )).all()
+    }
+    
+    # Total salary disbursed this month
+    total_salary = paid_by_period.get((current_year, current_month), 0.0)
+    last_month_salary = paid_by_period.get((last_month_year, last_month), 0.0)
+    salary_trend = ((total_salary - last_month_salary) / last_month_salary * 100) if last_month_salary > 0 else 0
+    
     # Monthly payroll summary
-    monthly_summary = {}
-    for month in range(1, 13):
-        month_salary = db.query(func.sum(SalarySlip.net_salary)).filter(
-            SalarySlip.month == month,
-            SalarySlip.year == current_year,
-            SalarySlip.status == "paid"
-        ).scalar() or 0.0
-        monthly_summary[month] = float(month_salary)
+    monthly_summary = {
+        month: paid_by_period.get((current_year, month), 0.0)
+        for month in range(1, 13)
+    }
     
     return DashboardStats(
         total_employees=total_employees,
@@ -79,43 +117,69 @@ async def get_dashboard_stats(
 
 
 @router.get("/employees", response_model=List[UserResponse])
+@response_cache.cached(tags=["users"])
 async def get_employees(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     department: Optional[str] = None,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all employees with filtering and pagination."""
-    query = db.query(User).filter(User.role == "employee")
+    query = select(*response_columns(UserResponse, User)).where(User.role == "employee")
     
     if search:
-        query = query.filter(
-            or_(
-                User.full_name.ilike(f"%{search}%"),
-                User.email.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(employee_search_filter(db, search))
     
     if department:
-        query = query.filter(User.department == department)
-    
-    employees = query.offset(skip).limit(limit).all()
-    return [UserResponse.model_validate(emp) for emp in employees]
+        query = query.where(User.department == department)
+    
+    sort_key = [User.id]
+    employees = (await db.execute(
+        keyset_paginate(query, sort_key, cursor, skip, limit, descending=False)
+    )).all()
+    set_next_cursor(response, employees, sort_key, limit)
+    return rows_response([dict(emp._mapping) for emp in employees], response)
+
+
+@router.get("/employees/search", response_model=EmployeeSearchResponse)
+@response_cache.cached(tags=["users"])
+async def search_employees_ranked(
+    q: str = Query(..., min_length=1),
+    department: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search employees by name or email with typo tolerance, ranking and department facets."""
+    result = await search_employees(db, q, department, limit)
+    return model_response(EmployeeSearchResponse, EmployeeSearchResponse(
+        results=[
+            {"employee": UserResponse.model_validate(hit["employee"]), "score": hit["score"]}
+            for hit in result["results"]
+        ],
+        facets=result["facets"],
+        total=result["total"],
+        fuzzy=result["fuzzy"],
+    ))
 
 
 @router.get("/employees/{employee_id}", response_model=UserResponse)
 async def get_employee(
     employee_id: int,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get employee details."""
-    employee = db.query(User).filter(
-        User.id == employee_id,
-        User.role == "employee"
-    ).first()
+    employee = await db.scalar(
+        select(User).where(
+            User.id == employee_id,
+            User.role == "employee"
+        )
+    )
     
     if not employee:
         raise HTTPException(
@@ -126,41 +190,93 @@ async def get_employee(
     return UserResponse.model_validate(employee)
 
 
+async def _set_employee_active(db: AsyncSession, employee_id: int, is_active: bool) -> User:
+    employee = await db.scalar(
+        select(User).where(
+            User.id == employee_id,
+            User.role == "employee"
+        )
+    )
+    
+    if not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+    
+    employee.is_active = is_active
+    await db.commit()
+    await db.refresh(employee)
+    principal_cache.invalidate_user(employee.id)
+    await response_cache.invalidate("users", f"user:{employee.id}")
+    return employee
+
+
+@router.put("/employees/{employee_id}/deactivate", response_model=UserResponse)
+async def deactivate_employee(
+    employee_id: int,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Deactivate an employee account; it is rejected on its next request."""
+    employee = await _set_employee_active(db, employee_id, False)
+    return UserResponse.model_validate(employee)
+
+
+@router.put("/employees/{employee_id}/activate", response_model=UserResponse)
+async def activate_employee(
+    employee_id: int,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Reactivate a deactivated employee account."""
+    employee = await _set_employee_active(db, employee_id, True)
+    return UserResponse.model_validate(employee)
+
+
 @router.post("/salary-slip", response_model=SalarySlipResponse, status_code=status.HTTP_201_CREATED)
 async def create_salary_slip(
     salary_slip: SalarySlipCreate,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new salary slip."""
     # Verify employee exists
-    employee = db.query(User).filter(User.id == salary_slip.employee_id).first()
+    employee = await db.get(User, salary_slip.employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
     
-    # Calculate net salary
-    net_salary = (
-        salary_slip.basic_salary +
-        salary_slip.allowances -
-        salary_slip.deductions -
-        salary_slip.tax
-    )
+    slip_data = salary_slip.model_dump()
+    if slip_data["tax"] is None:
+        try:
+            slip_data["tax"] = monthly_tax(
+                taxable_pay(salary_slip.basic_salary, salary_slip.allowances, salary_slip.deductions),
+                salary_slip.year
+            )
+        except TaxTableNotFound as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
     
     new_salary_slip = SalarySlip(
-        **salary_slip.model_dump(),
-        net_salary=net_salary,
+        **slip_data,
+        net_salary=net_salary(
+            salary_slip.basic_salary, salary_slip.allowances, salary_slip.deductions, slip_data["tax"]
+        ),
         status="pending"
     )
     
     db.add(new_salary_slip)
-    db.commit()
-    db.refresh(new_salary_slip)
+    deltas = PayrollAggregateDeltas()
+    deltas.add_slip(new_salary_slip, employee.department)
+    await apply_payroll_aggregate_deltas(db, deltas)
     
     # Create notification
-    create_notification(
+    await create_notification(
         db=db,
         user_id=employee.id,
         type=NotificationType.SALARY_SLIP,
@@ -168,102 +284,183 @@ async def create_salary_slip(
         message=f"Your salary slip for {salary_slip.month}/{salary_slip.year} has been generated."
     )
     
+    await db.commit()
+    await db.refresh(new_salary_slip, ["employee"])
+    await response_cache.invalidate("salary_slips", f"user:{employee.id}")
+    
     return SalarySlipResponse.model_validate(new_salary_slip)
 
 
-@router.post("/salary-slips/bulk", response_model=List[SalarySlipResponse], status_code=status.HTTP_201_CREATED)
+@router.post("/salary-slips/bulk", response_model=BulkSalarySlipResult, status_code=status.HTTP_201_CREATED)
 async def bulk_create_salary_slips(
     salary_slips: List[SalarySlipCreate],
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Bulk create salary slips."""
-    created_slips = []
-    
-    for slip_data in salary_slips:
-        employee = db.query(User).filter(User.id == slip_data.employee_id).first()
-        if not employee:
-            continue
-        
-        net_salary = (
-            slip_data.basic_salary +
-            slip_data.allowances -
-            slip_data.deductions -
-            slip_data.tax
-        )
-        
-        new_slip = SalarySlip(
-            **slip_data.model_dump(),
-            net_salary=net_salary,
-            status="pending"
-        )
-        
-        db.add(new_slip)
-        created_slips.append(new_slip)
-        
-        # Create notification
-        create_notification(
-            db=db,
-            user_id=employee.id,
-            type=NotificationType.SALARY_SLIP,
-            title="New Salary Slip Generated",
-            message=f"Your salary slip for {slip_data.month}/{slip_data.year} has been generated."
+    """Bulk create salary slips in a single transaction, reporting rows that failed."""
+    created_slips, errors = await bulk_insert_salary_slips(db, salary_slips)
+    await db.commit()
+    await response_cache.invalidate(
+        "salary_slips", *{f"user:{slip.employee_id}" for slip in created_slips}
+    )
+    
+    return model_response(BulkSalarySlipResult, BulkSalarySlipResult(
+        created=[SalarySlipResponse.model_validate(slip) for slip in created_slips],
+        errors=errors
+    ), status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/salary-slips/import", response_model=SalarySlipImportResult, status_code=status.HTTP_201_CREATED)
+async def import_salary_slips_file(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Import salary slips from a CSV or XLSX file, in batched transactions."""
+    file_ext = Path(file.filename or "").suffix.lower()
+    if file_ext not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(sorted(IMPORT_FORMATS))}"
         )
     
-    db.commit()
+    return await import_salary_slips(db, file.file, file_ext)
+
+
+@router.get("/salary-slips/import/{import_id}/errors.csv")
+async def download_import_error_report(
+    import_id: str,
+    current_user: User = Depends(get_current_active_admin)
+):
+    """Download the rejected rows of a salary slip import."""
+    report_path = error_report_path(import_id)
+    if report_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Error report not found"
+        )
     
-    for slip in created_slips:
-        db.refresh(slip)
+    return FileResponse(
+        path=report_path,
+        media_type="text/csv",
+        filename=f"salary_slip_import_{import_id}_errors.csv"
+    )
+
+
+@router.post("/payroll-runs", response_model=PayrollRunResponse, status_code=status.HTTP_201_CREATED)
+async def create_payroll_run(
+    run_in: PayrollRunCreate,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Generate a period's salary slips for every active employee from their latest compensation."""
+    try:
+        run, employee_ids = await run_payroll(db, run_in, current_user.id)
+    except TaxTableNotFound as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    await db.commit()
+    await response_cache.invalidate("salary_slips", *{f"user:{employee_id}" for employee_id in employee_ids})
     
-    return [SalarySlipResponse.model_validate(slip) for slip in created_slips]
+    return PayrollRunResponse.model_validate(run)
+
+
+@router.get("/payroll-runs", response_model=List[PayrollRunResponse])
+async def get_payroll_runs(
+    limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the most recent payroll runs."""
+    runs = (await db.scalars(
+        select(PayrollRun).order_by(PayrollRun.id.desc()).limit(limit)
+    )).all()
+    return [PayrollRunResponse.model_validate(run) for run in runs]
 
 
 @router.get("/salary-slips", response_model=List[SalarySlipResponse])
 async def get_all_salary_slips(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     employee_id: Optional[int] = None,
     month: Optional[int] = None,
     year: Optional[int] = None,
+    include: Optional[str] = include_query("employee"),
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all salary slips with filtering."""
-    query = db.query(SalarySlip)
+    """Get all salary slips with filtering; ``include=employee`` embeds each slip's employee."""
+    query = select(*response_columns(SalarySlipResponse, SalarySlip))
     
     if employee_id:
-        query = query.filter(SalarySlip.employee_id == employee_id)
+        query = query.where(SalarySlip.employee_id == employee_id)
     if month:
-        query = query.filter(SalarySlip.month == month)
+        query = query.where(SalarySlip.month == month)
     if year:
-        query = query.filter(SalarySlip.year == year)
+        query = query.where(SalarySlip.year == year)
     
-    slips = query.order_by(SalarySlip.year.desc(), SalarySlip.month.desc()).offset(skip).limit(limit).all()
-    return [SalarySlipResponse.model_validate(slip) for slip in slips]
+    sort_key = [SalarySlip.year, SalarySlip.month, SalarySlip.id]
+    slips = (await db.execute(keyset_paginate(query, sort_key, cursor, skip, limit))).all()
+    set_next_cursor(response, slips, sort_key, limit)
+    return rows_response(await embed_employees(db, [dict(slip._mapping) for slip in slips], include), response)
+
+
+@router.get("/salary-slips/export.zip")
+async def export_salary_slips_zip(
+    month: int = Query(..., ge=1, le=12),
+    year: int = Query(...),
+    department: Optional[str] = None,
+    current_user: User = Depends(get_current_active_admin),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Download every salary slip of a payroll period as a streamed ZIP of PDFs."""
+    first_slip = await db.scalar(
+        select(SalarySlip.id)
+        .join(User, User.id == SalarySlip.employee_id)
+        .where(*export_filters(month, year, department))
+        .limit(1)
+    )
+    if first_slip is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No salary slips found for this period",
+        )
+
+    return StreamingResponse(
+        stream_salary_slips_zip(month, year, department),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=salary_slips_{month}_{year}.zip"
+        },
+    )
 
 
 @router.get("/salary-slips/{slip_id}/pdf")
 async def admin_download_salary_slip_pdf(
     slip_id: int,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Download any employee's salary slip as PDF (admin only)."""
-    slip = db.query(SalarySlip).filter(SalarySlip.id == slip_id).first()
+    slip = await db.get(SalarySlip, slip_id)
     if not slip:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Salary slip not found",
         )
 
-    employee = db.query(User).filter(User.id == slip.employee_id).first()
+    employee = await db.get(User, slip.employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found",
         )
 
-    pdf_bytes = generate_salary_slip_pdf(slip, employee)
+    pdf_bytes = await get_salary_slip_pdf(slip, employee)
 
     from fastapi.responses import Response
 
@@ -281,10 +478,10 @@ async def update_salary_slip(
     slip_id: int,
     slip_update: SalarySlipUpdate,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a salary slip."""
-    slip = db.query(SalarySlip).filter(SalarySlip.id == slip_id).first()
+    slip = await db.get(SalarySlip, slip_id, options=[selectinload(SalarySlip.employee)])
     if not slip:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -292,6 +489,16 @@ async def update_salary_slip(
         )
     
     update_data = slip_update.model_dump(exclude_unset=True)
+    deltas = PayrollAggregateDeltas()
+    deltas.add_slip(slip, slip.employee.department, sign=-1)
+    
+    try:
+        refresh_derived_tax(slip, update_data)
+    except TaxTableNotFound as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
     
     # Recalculate net salary if salary components changed
     if any(key in update_data for key in ["basic_salary", "allowances", "deductions", "tax"]):
@@ -299,13 +506,17 @@ async def update_salary_slip(
         allowances = update_data.get("allowances", slip.allowances)
         deductions = update_data.get("deductions", slip.deductions)
         tax = update_data.get("tax", slip.tax)
-        update_data["net_salary"] = basic + allowances - deductions - tax
+        update_data["net_salary"] = net_salary(basic, allowances, deductions, tax)
     
     for key, value in update_data.items():
         setattr(slip, key, value)
     
-    db.commit()
-    db.refresh(slip)
+    deltas.add_slip(slip, slip.employee.department)
+    await apply_payroll_aggregate_deltas(db, deltas)
+    await db.commit()
+    await db.refresh(slip, ["employee"])
+    await run_in_threadpool(pdf_cache.invalidate, slip.id)
+    await response_cache.invalidate("salary_slips", f"user:{slip.employee_id}")
     
     return SalarySlipResponse.model_validate(slip)
 
@@ -314,40 +525,80 @@ async def update_salary_slip(
 async def delete_salary_slip(
     slip_id: int,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a salary slip."""
-    slip = db.query(SalarySlip).filter(SalarySlip.id == slip_id).first()
+    slip = await db.get(SalarySlip, slip_id, options=[selectinload(SalarySlip.employee)])
     if not slip:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Salary slip not found"
         )
     
-    db.delete(slip)
-    db.commit()
+    deltas = PayrollAggregateDeltas()
+    deltas.add_slip(slip, slip.employee.department, sign=-1)
+    await apply_payroll_aggregate_deltas(db, deltas)
+    await db.delete(slip)
+    await db.commit()
+    await run_in_threadpool(pdf_cache.invalidate, slip_id)
+    await response_cache.invalidate("salary_slips", f"user:{slip.employee_id}")
     return None
 
 
+@router.get("/reports/payroll-register.xlsx")
+async def download_payroll_register(
+    year: int = Query(...),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    department: Optional[str] = None,
+    current_user: User = Depends(get_current_active_admin)
+):
+    """Download the payroll register for a year or month as an Excel workbook."""
+    period = f"{month:02d}_{year}" if month else str(year)
+    
+    return StreamingResponse(
+        stream_payroll_register(year, month, department),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={
+            "Content-Disposition": f"attachment; filename=payroll_register_{period}.xlsx"
+        },
+    )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_active_admin)):
+    """Get hit/miss counters for the server-side caches."""
+    return {
+        "pdf": pdf_cache.stats(),
+        "responses": response_cache.stats(),
+        "principals": principal_cache.stats(),
+        "notification_streams": notification_hub.stats(),
+    }
+
+
 @router.get("/expenses", response_model=List[ExpenseResponse])
 async def get_all_expenses(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     status_filter: Optional[ExpenseStatus] = None,
     employee_id: Optional[int] = None,
+    include: Optional[str] = include_query("employee"),
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all expenses with filtering."""
-    query = db.query(Expense)
+    """Get all expenses with filtering; ``include=employee`` embeds each expense's employee."""
+    query = select(*response_columns(ExpenseResponse, Expense))
     
     if status_filter:
-        query = query.filter(Expense.status == status_filter)
+        query = query.where(Expense.status == status_filter)
     if employee_id:
-        query = query.filter(Expense.employee_id == employee_id)
+        query = query.where(Expense.employee_id == employee_id)
     
-    expenses = query.order_by(Expense.created_at.desc()).offset(skip).limit(limit).all()
-    return [ExpenseResponse.model_validate(exp) for exp in expenses]
+    sort_key = [Expense.created_at, Expense.id]
+    expenses = (await db.execute(keyset_paginate(query, sort_key, cursor, skip, limit))).all()
+    set_next_cursor(response, expenses, sort_key, limit)
+    return rows_response(await embed_employees(db, [dict(exp._mapping) for exp in expenses], include), response)
 
 
 @router.put("/expenses/{expense_id}/approve", response_model=ExpenseResponse)
@@ -355,10 +606,10 @@ async def approve_expense(
     expense_id: int,
     approval: ExpenseApproval,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Approve an expense."""
-    expense = db.query(Expense).filter(Expense.id == expense_id).first()
+    expense = await db.get(Expense, expense_id, options=[selectinload(Expense.employee)])
     if not expense:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -370,11 +621,8 @@ async def approve_expense(
     expense.reviewed_by = current_user.id
     expense.reviewed_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(expense)
-    
     # Create notification
-    create_notification(
+    await create_notification(
         db=db,
         user_id=expense.employee_id,
         type=NotificationType.EXPENSE_APPROVED,
@@ -382,6 +630,10 @@ async def approve_expense(
         message=f"Your expense of ${expense.amount} has been approved."
     )
     
+    await db.commit()
+    await db.refresh(expense, ["employee"])
+    await response_cache.invalidate("expenses", f"user:{expense.employee_id}")
+    
     return ExpenseResponse.model_validate(expense)
 
 
@@ -390,10 +642,10 @@ async def reject_expense(
     expense_id: int,
     approval: ExpenseApproval,
     current_user: User = Depends(get_current_active_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reject an expense."""
-    expense = db.query(Expense).filter(Expense.id == expense_id).first()
+    expense = await db.get(Expense, expense_id, options=[selectinload(Expense.employee)])
     if not expense:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -405,11 +657,8 @@ async def reject_expense(
     expense.reviewed_by = current_user.id
     expense.reviewed_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(expense)
-    
     # Create notification
-    create_notification(
+    await create_notification(
         db=db,
         user_id=expense.employee_id,
         type=NotificationType.EXPENSE_REJECTED,
@@ -417,5 +666,9 @@ async def reject_expense(
         message=f"Your expense of ${expense.amount} has been rejected. {approval.comment or ''}"
     )
     
+    await db.commit()
+    await db.refresh(expense, ["employee"])
+    await response_cache.invalidate("expenses", f"user:{expense.employee_id}")
+    
     return ExpenseResponse.model_validate(expense)
 
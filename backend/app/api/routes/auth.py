@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_and_rehash_password,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     decode_token
 )
+from app.core.cache import principal_cache, response_cache
 from app.core.config import settings
 from app.models.user import User, UserRole
 from app.schemas.auth import LoginRequest, SignupRequest, Token
@@ -18,10 +20,10 @@ router = APIRouter()
 
 
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(request: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == request.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,7 +31,7 @@ async def signup(request: SignupRequest, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await get_password_hash_async(request.password)
     new_user = User(
         email=request.email,
         hashed_password=hashed_password,
@@ -40,8 +42,9 @@ async def signup(request: SignupRequest, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    await response_cache.invalidate("users")
     
     # Create tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -61,11 +64,18 @@ async def signup(request: SignupRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return tokens."""
-    user = db.query(User).filter(User.email == request.email).first()
+    user = await db.scalar(select(User).where(User.email == request.email))
     
-    if not user or not verify_password(request.password, user.hashed_password):
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password"
+        )
+    
+    valid, new_hash = await verify_and_rehash_password(request.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -77,6 +87,11 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
     
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        principal_cache.invalidate_user(user.id)
+    
     # Create tokens
     expires_delta = (
         timedelta(days=30)
@@ -99,7 +114,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(request: dict, db: Session = Depends(get_db)):
+async def refresh_token(request: dict, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token."""
     refresh_token = request.get("refresh_token")
     if not refresh_token:
@@ -116,7 +131,7 @@ async def refresh_token(request: dict, db: Session = Depends(get_db)):
         )
     
     email = payload.get("sub")
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -155,9 +170,9 @@ async def logout():
 
 
 @router.post("/forgot-password")
-async def forgot_password(email: str, db: Session = Depends(get_db)):
+async def forgot_password(email: str, db: AsyncSession = Depends(get_async_db)):
     """Request password reset (simplified - in production, send email)."""
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         # Don't reveal if email exists
         return {"message": "If email exists, password reset link has been sent"}
@@ -167,7 +182,7 @@ async def forgot_password(email: str, db: Session = Depends(get_db)):
 
 
 @router.post("/reset-password")
-async def reset_password(token: str, new_password: str, db: Session = Depends(get_db)):
+async def reset_password(token: str, new_password: str, db: AsyncSession = Depends(get_async_db)):
     """Reset password using token."""
     # In production, verify reset token
     # For now, simplified version
@@ -179,7 +194,7 @@ async def reset_password(token: str, new_password: str, db: Session = Depends(ge
         )
     
     email = payload.get("sub")
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     
     if not user:
         raise HTTPException(
@@ -187,8 +202,9 @@ async def reset_password(token: str, new_password: str, db: Session = Depends(ge
             detail="User not found"
         )
     
-    user.hashed_password = get_password_hash(new_password)
-    db.commit()
+    user.hashed_password = await get_password_hash_async(new_password)
+    await db.commit()
+    principal_cache.invalidate_user(user.id)
     
     return {"message": "Password reset successfully"}
 
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends
-from fastapi.responses import FileResponse
-import os
-import uuid
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, status, Depends, Query, Request
 from pathlib import Path
-from app.core.config import settings
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.services.file_renditions import generate_renditions, get_rendition
+from app.services.file_serving import file_response, guess_media_type
+from app.services.file_storage import UPLOAD_DIR, resolve_upload_path, store_upload
 
 router = APIRouter()
 
-UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 ALLOWED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".pdf"}
@@ -15,7 +16,11 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
 
 @router.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Upload a file (image or PDF)."""
     # Validate file extension
     file_ext = Path(file.filename).suffix.lower()
@@ -25,54 +30,56 @@ async def upload_file(file: UploadFile = File(...)):
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Generate unique filename
-    file_id = str(uuid.uuid4())
-    filename = f"{file_id}{file_ext}"
-    file_path = UPLOAD_DIR / filename
+    # Stream to content-addressed storage, enforcing the size limit as it goes
+    uploaded = await store_upload(db, file, file_ext, MAX_FILE_SIZE)
+    # Thumbnail/preview renditions are rendered off the request path
+    background_tasks.add_task(generate_renditions, UPLOAD_DIR / uploaded.storage_path)
     
-    # Read and validate file size
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size exceeds 10MB limit"
-        )
-    
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(contents)
-    
-    # Return file URL
-    file_url = f"/uploads/{filename}"
     return {
-        "filename": filename,
-        "url": file_url,
-        "size": len(contents),
+        "filename": uploaded.name,
+        "url": f"/files/{uploaded.name}",
+        "size": uploaded.size,
         "content_type": file.content_type
     }
 
 
 @router.get("/files/{filename}")
-async def get_file(filename: str):
-    """Get uploaded file."""
-    file_path = UPLOAD_DIR / filename
+@router.get("/uploads/{filename}", include_in_schema=False)
+async def get_file(
+    filename: str,
+    request: Request,
+    size: Optional[str] = Query(None, pattern="^(thumb|preview)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get uploaded file, or a thumb/preview rendition of an uploaded image."""
+    # Security: prevent directory traversal
+    if Path(filename).name != filename:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
     
-    if not file_path.exists():
+    resolved = await resolve_upload_path(db, filename)
+    if resolved is None or not resolved[0].exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
+    path, record = resolved
+    # Content hash for recorded uploads; legacy files fall back to a stat-based tag
+    etag = f'"{record.sha256}"' if record is not None else None
     
-    # Security: prevent directory traversal
-    if not file_path.is_relative_to(UPLOAD_DIR):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
+    if size:
+        rendition = await get_rendition(path, size, request.headers.get("accept", ""))
+        if rendition is not None:
+            rendition_file, media_type = rendition
+            rendition_etag = f'"{record.sha256}.{size}{rendition_file.suffix}"' if record is not None else None
+            return await file_response(request, rendition_file, media_type, etag=rendition_etag, vary="Accept")
     
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="application/octet-stream"
+    return await file_response(
+        request,
+        path,
+        record.content_type if record is not None else guess_media_type(filename),
+        etag=etag,
+        filename=record.original_filename if record is not None and record.original_filename else filename,
     )
-
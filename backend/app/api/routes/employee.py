@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from datetime import date, datetime
+from app.core.cache import principal_cache, response_cache
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.serialization import response_columns, rows_response
+from app.api.dependencies import get_current_user, get_current_user_for_stream
 from app.models.user import User
 from app.models.salary_slip import SalarySlip
 from app.models.expense import Expense, ExpenseStatus, ExpenseCategory
@@ -11,36 +18,86 @@ from app.models.notification import Notification
 from app.schemas.user import UserUpdate, UserResponse
 from app.schemas.salary_slip import SalarySlipResponse
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseResponse
-from app.schemas.dashboard import EmployeeStats
-from app.schemas.notification import NotificationResponse
-from app.services.pdf_service import generate_salary_slip_pdf
-from app.core.security import get_password_hash, verify_password
+from app.schemas.dashboard import EmployeeStats, ExpenseCategoryBreakdown, MonthlyExpenseBreakdown
+from app.schemas.notification import NotificationResponse, NotificationReadRequest, NotificationReadResult, StreamTicket, UnreadCount
+from app.services.notification_hub import CLOSE_STREAM, notification_hub
+from app.services.notification_service import (
+    get_notifications_after, get_unread_count, issue_stream_ticket, mark_notifications_read
+)
+from app.services.payroll_aggregate_service import move_employee_aggregates
+from app.services.pdf_cache import get_salary_slip_pdf
+from app.core.security import get_password_hash_async, verify_password_async
+from app.utils.loading import embed_employees, include_query
+from app.utils.pagination import keyset_paginate, set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/dashboard/stats", response_model=EmployeeStats)
+@response_cache.cached(tags=lambda kwargs: [f"user:{kwargs['current_user'].id}"], per_user=True)
 async def get_employee_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get employee dashboard statistics."""
-    total_slips = db.query(SalarySlip).filter(SalarySlip.employee_id == current_user.id).count()
+    is_approved = Expense.status == ExpenseStatus.APPROVED
+    approved_amount = func.coalesce(func.sum(case((is_approved, Expense.amount), else_=0.0)), 0.0)
+    total_slips = (
+        select(func.count())
+        .select_from(SalarySlip)
+        .where(SalarySlip.employee_id == current_user.id)
+        .scalar_subquery()
+    )
+    
+    # Totals in one aggregate pass over the employee's expenses
+    totals = (await db.execute(
+        select(
+            total_slips,
+            func.count(Expense.id),
+            func.coalesce(func.sum(case((Expense.status == ExpenseStatus.PENDING, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((is_approved, 1), else_=0)), 0),
+            func.coalesce(func.sum(Expense.amount), 0.0),
+            approved_amount
+        ).where(Expense.employee_id == current_user.id)
+    )).one()
+    
+    categories = (await db.execute(
+        select(Expense.category, func.count(), func.sum(Expense.amount), approved_amount)
+        .where(Expense.employee_id == current_user.id)
+        .group_by(Expense.category)
+        .order_by(Expense.category)
+    )).all()
     
-    expenses = db.query(Expense).filter(Expense.employee_id == current_user.id).all()
-    total_expenses = len(expenses)
-    pending_expenses = len([e for e in expenses if e.status == ExpenseStatus.PENDING])
-    approved_expenses = len([e for e in expenses if e.status == ExpenseStatus.APPROVED])
-    total_amount = sum(e.amount for e in expenses)
-    approved_amount = sum(e.amount for e in expenses if e.status == ExpenseStatus.APPROVED)
+    # Last 12 months, including the current one
+    today = date.today()
+    months_back = today.year * 12 + today.month - 12
+    window_start = date(months_back // 12, months_back % 12 + 1, 1)
+    year = extract("year", Expense.expense_date)
+    month = extract("month", Expense.expense_date)
+    months = (await db.execute(
+        select(year, month, func.count(), func.sum(Expense.amount), approved_amount)
+        .where(Expense.employee_id == current_user.id, Expense.expense_date >= window_start)
+        .group_by(year, month)
+        .order_by(year, month)
+    )).all()
     
     return EmployeeStats(
-        total_salary_slips=total_slips,
-        total_expenses=total_expenses,
-        pending_expenses=pending_expenses,
-        approved_expenses=approved_expenses,
-        total_expense_amount=total_amount,
-        total_approved_amount=approved_amount
+        total_salary_slips=totals[0],
+        total_expenses=totals[1],
+        pending_expenses=totals[2],
+        approved_expenses=totals[3],
+        total_expense_amount=totals[4],
+        total_approved_amount=totals[5],
+        monthly_breakdown=[
+            MonthlyExpenseBreakdown(
+                year=row_year, month=row_month, count=count, amount=amount, approved_amount=approved
+            )
+            for row_year, row_month, count, amount, approved in months
+        ],
+        category_breakdown=[
+            ExpenseCategoryBreakdown(category=category, count=count, amount=amount, approved_amount=approved)
+            for category, count, amount, approved in categories
+        ]
     )
 
 
@@ -54,16 +111,23 @@ async def get_profile(current_user: User = Depends(get_current_user)):
 async def update_profile(
     profile_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile."""
     update_data = profile_update.model_dump(exclude_unset=True)
     
+    if "department" in update_data:
+        await move_employee_aggregates(
+            db, current_user.id, current_user.department, update_data["department"]
+        )
+    
     for key, value in update_data.items():
         setattr(current_user, key, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    principal_cache.invalidate_user(current_user.id)
+    await response_cache.invalidate("users", f"user:{current_user.id}")
     
     return UserResponse.model_validate(current_user)
 
@@ -72,43 +136,51 @@ async def update_profile(
 async def upload_avatar(
     avatar_url: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update avatar URL (in production, handle file upload)."""
     current_user.avatar_url = avatar_url
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate_user(current_user.id)
+    await response_cache.invalidate("users", f"user:{current_user.id}")
     return {"message": "Avatar updated successfully", "avatar_url": avatar_url}
 
 
 @router.get("/salary-slips", response_model=List[SalarySlipResponse])
+@response_cache.cached(tags=lambda kwargs: [f"user:{kwargs['current_user'].id}"], per_user=True)
 async def get_my_salary_slips(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    include: Optional[str] = include_query("employee"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's salary slips."""
-    slips = db.query(SalarySlip).filter(
-        SalarySlip.employee_id == current_user.id
-    ).order_by(
-        SalarySlip.year.desc(),
-        SalarySlip.month.desc()
-    ).offset(skip).limit(limit).all()
+    slips = (await db.execute(
+        select(*response_columns(SalarySlipResponse, SalarySlip)).where(
+            SalarySlip.employee_id == current_user.id
+        ).order_by(
+            SalarySlip.year.desc(),
+            SalarySlip.month.desc()
+        ).offset(skip).limit(limit)
+    )).all()
     
-    return [SalarySlipResponse.model_validate(slip) for slip in slips]
+    return rows_response(await embed_employees(db, [dict(slip._mapping) for slip in slips], include))
 
 
 @router.get("/salary-slips/{slip_id}/pdf")
 async def download_salary_slip_pdf(
     slip_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Download salary slip as PDF."""
-    slip = db.query(SalarySlip).filter(
-        SalarySlip.id == slip_id,
-        SalarySlip.employee_id == current_user.id
-    ).first()
+    slip = await db.scalar(
+        select(SalarySlip).where(
+            SalarySlip.id == slip_id,
+            SalarySlip.employee_id == current_user.id
+        )
+    )
     
     if not slip:
         raise HTTPException(
@@ -116,7 +188,7 @@ async def download_salary_slip_pdf(
             detail="Salary slip not found"
         )
     
-    pdf_bytes = generate_salary_slip_pdf(slip, current_user)
+    pdf_bytes = await get_salary_slip_pdf(slip, current_user)
     
     from fastapi.responses import Response
     return Response(
@@ -132,7 +204,7 @@ async def download_salary_slip_pdf(
 async def create_expense(
     expense: ExpenseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit a new expense."""
     new_expense = Expense(
@@ -142,28 +214,34 @@ async def create_expense(
     )
     
     db.add(new_expense)
-    db.commit()
-    db.refresh(new_expense)
+    await db.commit()
+    await db.refresh(new_expense)
+    await response_cache.invalidate("expenses", f"user:{current_user.id}")
     
     return ExpenseResponse.model_validate(new_expense)
 
 
 @router.get("/expenses", response_model=List[ExpenseResponse])
 async def get_my_expenses(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     status_filter: Optional[ExpenseStatus] = None,
+    include: Optional[str] = include_query("employee"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's expenses."""
-    query = db.query(Expense).filter(Expense.employee_id == current_user.id)
+    query = select(*response_columns(ExpenseResponse, Expense)).where(Expense.employee_id == current_user.id)
     
     if status_filter:
-        query = query.filter(Expense.status == status_filter)
+        query = query.where(Expense.status == status_filter)
     
-    expenses = query.order_by(Expense.created_at.desc()).offset(skip).limit(limit).all()
-    return [ExpenseResponse.model_validate(exp) for exp in expenses]
+    sort_key = [Expense.created_at, Expense.id]
+    expenses = (await db.execute(keyset_paginate(query, sort_key, cursor, skip, limit))).all()
+    set_next_cursor(response, expenses, sort_key, limit)
+    return rows_response(await embed_employees(db, [dict(exp._mapping) for exp in expenses], include), response)
 
 
 @router.put("/expenses/{expense_id}", response_model=ExpenseResponse)
@@ -171,13 +249,15 @@ async def update_expense(
     expense_id: int,
     expense_update: ExpenseUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an expense (only if pending)."""
-    expense = db.query(Expense).filter(
-        Expense.id == expense_id,
-        Expense.employee_id == current_user.id
-    ).first()
+    expense = await db.scalar(
+        select(Expense).where(
+            Expense.id == expense_id,
+            Expense.employee_id == current_user.id
+        )
+    )
     
     if not expense:
         raise HTTPException(
@@ -195,8 +275,9 @@ async def update_expense(
     for key, value in update_data.items():
         setattr(expense, key, value)
     
-    db.commit()
-    db.refresh(expense)
+    await db.commit()
+    await db.refresh(expense)
+    await response_cache.invalidate("expenses", f"user:{current_user.id}")
     
     return ExpenseResponse.model_validate(expense)
 
@@ -205,13 +286,15 @@ async def update_expense(
 async def delete_expense(
     expense_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an expense (only if pending)."""
-    expense = db.query(Expense).filter(
-        Expense.id == expense_id,
-        Expense.employee_id == current_user.id
-    ).first()
+    expense = await db.scalar(
+        select(Expense).where(
+            Expense.id == expense_id,
+            Expense.employee_id == current_user.id
+        )
+    )
     
     if not expense:
         raise HTTPException(
@@ -225,40 +308,117 @@ async def delete_expense(
             detail="Can only delete pending expenses"
         )
     
-    db.delete(expense)
-    db.commit()
+    await db.delete(expense)
+    await db.commit()
+    await response_cache.invalidate("expenses", f"user:{current_user.id}")
     return None
 
 
 @router.get("/notifications", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     unread_only: bool = Query(False),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user notifications."""
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    query = select(*response_columns(NotificationResponse, Notification)).where(Notification.user_id == current_user.id)
     
     if unread_only:
-        query = query.filter(Notification.is_read == False)
+        query = query.where(Notification.is_read == False)
     
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
-    return [NotificationResponse.model_validate(notif) for notif in notifications]
+    sort_key = [Notification.created_at, Notification.id]
+    notifications = (await db.execute(keyset_paginate(query, sort_key, cursor, skip, limit))).all()
+    set_next_cursor(response, notifications, sort_key, limit)
+    return rows_response([dict(notif._mapping) for notif in notifications], response)
+
+
+@router.post("/notifications/stream-ticket", response_model=StreamTicket, status_code=status.HTTP_201_CREATED)
+async def create_notification_stream_ticket(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Issue a short-lived, single-use ticket for opening the notification stream."""
+    ticket = await issue_stream_ticket(db, current_user.id)
+    await db.commit()
+    return StreamTicket(ticket=ticket, expires_in=settings.NOTIFICATION_STREAM_TICKET_SECONDS)
+
+
+@router.get("/notifications/stream")
+async def stream_notifications(
+    current_user: User = Depends(get_current_user_for_stream),
+    last_event_id: Optional[str] = Header(None),
+    resume_after: Optional[str] = Query(None, alias="last_event_id"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Push new notifications as Server-Sent Events.
+    
+    The stream is opened with a ticket from POST /notifications/stream-ticket,
+    never with the access token, which would end up in access logs. Open
+    streams hold no database connection: events come from the notification
+    hub, and comment heartbeats keep proxies from timing out. A reconnecting
+    client's Last-Event-ID (header, or ``last_event_id`` for a fresh
+    EventSource) first replays what it missed.
+    """
+    user_id = current_user.id
+    # Subscribe before reading the backlog so nothing falls between the two.
+    queue = notification_hub.subscribe(user_id)
+    missed = []
+    last_event_id = last_event_id or resume_after
+    if last_event_id and last_event_id.isdigit():
+        missed = await get_notifications_after(db, user_id, int(last_event_id))
+    replayed_up_to = max((message["id"] for message in missed), default=0)
+    # The session stays open until the response ends; release it now.
+    await db.close()
+    
+    def format_event(message: dict) -> str:
+        return f"id: {message['id']}\nevent: notification\ndata: {json.dumps(message)}\n\n"
+    
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            for message in missed:
+                yield format_event(message)
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is CLOSE_STREAM:
+                    return
+                if message["id"] <= replayed_up_to:
+                    continue
+                yield format_event(message)
+        finally:
+            notification_hub.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.put("/notifications/{notification_id}/read", response_model=NotificationResponse)
 async def mark_notification_read(
     notification_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a notification as read."""
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
+    notification = await db.scalar(
+        select(Notification).where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        )
+    )
     
     if not notification:
         raise HTTPException(
@@ -266,29 +426,70 @@ async def mark_notification_read(
             detail="Notification not found"
         )
     
-    notification.is_read = True
-    db.commit()
-    db.refresh(notification)
+    await mark_notifications_read(db, current_user.id, [notification.id])
+    await db.commit()
+    await db.refresh(notification)
     
     return NotificationResponse.model_validate(notification)
 
 
+@router.get("/notifications/unread-count", response_model=UnreadCount)
+async def get_unread_notification_count(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the number of unread notifications (a single-row counter lookup)."""
+    return UnreadCount(unread_count=await get_unread_count(db, current_user.id))
+
+
+@router.post("/notifications/read", response_model=NotificationReadResult)
+async def mark_notifications_read_batch(
+    request: NotificationReadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mark the given notifications as read."""
+    updated = await mark_notifications_read(db, current_user.id, request.ids) if request.ids else 0
+    await db.commit()
+    
+    return NotificationReadResult(
+        updated=updated,
+        unread_count=await get_unread_count(db, current_user.id)
+    )
+
+
+@router.put("/notifications/read-all", response_model=NotificationReadResult)
+async def mark_all_notifications_read(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mark every notification as read."""
+    updated = await mark_notifications_read(db, current_user.id)
+    await db.commit()
+    
+    return NotificationReadResult(
+        updated=updated,
+        unread_count=await get_unread_count(db, current_user.id)
+    )
+
+
 @router.post("/change-password")
 async def change_password(
     current_password: str,
     new_password: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password."""
-    if not verify_password(current_password, current_user.hashed_password):
+    if not await verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
-    current_user.hashed_password = get_password_hash(new_password)
-    db.commit()
+    current_user.hashed_password = await get_password_hash_async(new_password)
+    await db.commit()
+    principal_cache.invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully"}
 
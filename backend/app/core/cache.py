@@ -0,0 +1,329 @@
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Iterable
+import orjson
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU mapping whose entries expire after a TTL."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Any):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheBackend:
+    """Storage for cached response bodies and invalidation tag versions."""
+
+    # Whether calls touch disk and should be moved off the event loop.
+    blocking = False
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    def get_tag_versions(self, tags: list[str]) -> dict[str, int]:
+        raise NotImplementedError
+
+    def bump_tags(self, tags: list[str]):
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend; invalidations are only seen by the current worker."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._entries = TTLCache(max_entries, ttl)
+        self._tag_versions: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._entries.set(key, value, ttl)
+
+    def get_tag_versions(self, tags: list[str]) -> dict[str, int]:
+        with self._lock:
+            return {tag: self._tag_versions[tag] for tag in tags}
+
+    def bump_tags(self, tags: list[str]):
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] += 1
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """File-backed backend shared by every worker process on the host."""
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune()
+
+    def _prune(self):
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE key IN ("
+            "SELECT key FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def get_tag_versions(self, tags: list[str]) -> dict[str, int]:
+        if not tags:
+            return {}
+        placeholders = ", ".join("?" for _ in tags)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT tag, version FROM cache_tags WHERE tag IN ({placeholders})", tags
+            ).fetchall()
+        versions = dict(rows)
+        return {tag: versions.get(tag, 0) for tag in tags}
+
+    def bump_tags(self, tags: list[str]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO cache_tags (tag, version) VALUES (?, 1) "
+                "ON CONFLICT(tag) DO UPDATE SET version = version + 1",
+                [(tag,) for tag in tags],
+            )
+
+
+class PrincipalCache:
+    """
+    Cache of verified JWT payloads (keyed by token signature) and of the
+    column values of authenticated users (keyed by user id).
+
+    Token entries never outlive the token's own ``exp`` claim; user entries
+    must be invalidated by every write that changes a user.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.ttl = ttl
+        self._tokens = TTLCache(max_entries, ttl)
+        self._users = TTLCache(max_entries, ttl)
+
+    @staticmethod
+    def _signature(token: str) -> str:
+        return token.rsplit(".", 1)[-1]
+
+    def get_token(self, token: str) -> dict | None:
+        return self._tokens.get(self._signature(token))
+
+    def set_token(self, token: str, payload: dict):
+        ttl = self.ttl
+        if "exp" in payload:
+            ttl = min(ttl, payload["exp"] - time.time())
+        if ttl > 0:
+            self._tokens.set(self._signature(token), payload, ttl)
+
+    def get_user(self, user_id: int) -> dict | None:
+        return self._users.get(user_id)
+
+    def set_user(self, user_id: int, values: dict):
+        self._users.set(user_id, values)
+
+    def invalidate_user(self, user_id: int):
+        self._users.delete(user_id)
+
+    def stats(self) -> dict:
+        return {"tokens": len(self._tokens), "users": len(self._users)}
+
+
+def _cache_key_part(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return None
+
+
+class ResponseCache:
+    """
+    Route-level JSON response cache with tag-based invalidation.
+
+    Cache keys embed the current version of every tag a route depends on, so
+    bumping a tag from a write route makes all dependent entries unreachable
+    at once (they age out through TTL/LRU eviction).
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._metrics: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    async def _call(self, method: Callable, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    def cached(
+        self,
+        tags: Iterable[str] | Callable[[dict], Iterable[str]],
+        per_user: bool = False,
+        ttl: float | None = None,
+    ):
+        """
+        Cache a route's JSON response.
+
+        ``tags`` is a list of tag names, or a callable receiving the route
+        kwargs. Scalar query/path parameters always vary the key; ``per_user``
+        also varies it by ``current_user``.
+        """
+
+        def decorator(func: Callable):
+            route_name = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(**kwargs):
+                route_tags = sorted(tags(kwargs) if callable(tags) else tags)
+                versions = await self._call(self.backend.get_tag_versions, route_tags)
+                vary = {
+                    name: _cache_key_part(value)
+                    for name, value in sorted(kwargs.items())
+                    if _cache_key_part(value) is not None
+                }
+                if per_user:
+                    vary["__user__"] = kwargs["current_user"].id
+                raw_key = json.dumps([route_name, vary, versions], sort_keys=True, default=str)
+                key = hashlib.sha256(raw_key.encode()).hexdigest()
+
+                cached = await self._call(self.backend.get, key)
+                if cached is not None:
+                    self._metrics[route_name]["hits"] += 1
+                    raw_headers, body = cached.split(b"\n", 1)
+                    headers = {**json.loads(raw_headers), "X-Cache": "HIT"}
+                    return Response(content=body, media_type="application/json", headers=headers)
+
+                self._metrics[route_name]["misses"] += 1
+                result = await func(**kwargs)
+                if isinstance(result, Response):
+                    # Routes on the serialization fast path return JSON already rendered.
+                    if result.status_code != 200 or result.media_type != "application/json":
+                        return result
+                    headers = {
+                        name: value for name, value in result.headers.items()
+                        if name.lower() not in ("content-length", "content-type")
+                    }
+                    body = result.body
+                else:
+                    # Headers the route set on its injected Response (e.g. pagination cursors).
+                    headers = {
+                        name: value
+                        for injected in kwargs.values() if isinstance(injected, Response)
+                        for name, value in injected.headers.items()
+                        if name.lower() not in ("content-length", "content-type")
+                    }
+                    body = orjson.dumps(jsonable_encoder(result))
+                entry = json.dumps(headers).encode() + b"\n" + body
+                await self._call(self.backend.set, key, entry, self.ttl if ttl is None else ttl)
+                return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
+
+            return wrapper
+
+        return decorator
+
+    async def invalidate(self, *tags: str):
+        """Invalidate every cached response depending on any of the given tags."""
+        if tags:
+            await self._call(self.backend.bump_tags, list(tags))
+
+    def stats(self) -> dict:
+        routes = {}
+        for route_name, counts in self._metrics.items():
+            lookups = counts["hits"] + counts["misses"]
+            routes[route_name] = {
+                **counts,
+                "hit_ratio": counts["hits"] / lookups if lookups else 0.0,
+            }
+        return {"backend": type(self.backend).__name__, "routes": routes}
+
+
+def _build_backend() -> CacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(settings.RESPONSE_CACHE_PATH, settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND '{settings.RESPONSE_CACHE_BACKEND}'")
+
+
+response_cache = ResponseCache(_build_backend(), settings.RESPONSE_CACHE_TTL_SECONDS)
+principal_cache = PrincipalCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
@@ -9,6 +9,30 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_QUEUE_LIMIT: int = 64
+    PDF_CACHE_DIR: str = "cache/pdf"
+    PDF_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    RESPONSE_CACHE_BACKEND: str = "memory"  # memory | sqlite (shared across workers)
+    RESPONSE_CACHE_PATH: str = "cache/responses.sqlite3"
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    IMPORT_REPORT_DIR: str = "cache/import_reports"
+    # Per-process; bounds how long another worker may honour a changed/deactivated user.
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU core
+    NOTIFICATION_DISPATCH_INTERVAL_SECONDS: float = 1.0
+    NOTIFICATION_DISPATCH_BATCH_SIZE: int = 1000
+    NOTIFICATION_BROKER: str = "local"  # local | postgres (LISTEN/NOTIFY, for multiple workers)
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = 15
+    NOTIFICATION_STREAM_TICKET_SECONDS: int = 30  # lifetime of the single-use ticket that opens a stream
+    RENDITION_WORKERS: int = 2
+    # Let the front proxy send file bodies: "" (serve from the app) | X-Accel-Redirect (nginx) | X-Sendfile
+    FILE_SENDFILE_HEADER: str = ""
+    FILE_SENDFILE_PREFIX: str = "/protected-uploads/"  # nginx internal location aliasing the upload dir
+    TAX_JURISDICTION: str = "US-FED-SINGLE"  # bracket table used when a slip's tax is not given
     
     class Config:
         env_file = ".env"
@@ -1,10 +1,24 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes needs_update() flag any hash
+# created with a different cost, so it is upgraded (or downgraded) on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_hash_executor: ThreadPoolExecutor | None = None
+_hash_slots: asyncio.Semaphore | None = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,6 +31,68 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _hash_worker_count() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=_hash_worker_count(), thread_name_prefix="password-hash"
+        )
+    return _hash_executor
+
+
+def _get_hash_slots() -> asyncio.Semaphore:
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(_hash_worker_count())
+    return _hash_slots
+
+
+async def _run_hash(func, *args):
+    # bcrypt releases the GIL, so hashes run in parallel on the dedicated
+    # executor; the semaphore queues excess requests on the event loop rather
+    # than letting them crowd the default threadpool other endpoints use.
+    async with _get_hash_slots():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash off the event loop."""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop."""
+    return await _run_hash(get_password_hash, password)
+
+
+async def verify_and_rehash_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses outdated settings, return a new hash.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is None unless the caller
+    should store a replacement.
+    """
+    if not await verify_password_async(plain_password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, await get_password_hash_async(plain_password)
+    return True, None
+
+
+def shutdown_password_hasher():
+    """Stop the password hashing threads."""
+    global _hash_executor, _hash_slots
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+    _hash_slots = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -0,0 +1,56 @@
+from functools import lru_cache
+from typing import Any
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+# Headers of an injected Response that must not be copied onto a rendered one.
+_RENDERED_HEADERS = ("content-length", "content-type")
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter for ``tp`` (e.g. ``List[SalarySlipResponse]``), built once per type."""
+    return TypeAdapter(tp)
+
+
+@lru_cache(maxsize=None)
+def response_columns(schema: type[BaseModel], model: Any) -> tuple:
+    """Table columns of ``model`` backing the scalar fields of ``schema``, in field order."""
+    table = model.__table__
+    return tuple(table.c[name] for name in schema.model_fields if name in table.c)
+
+
+def _headers(response: Response | None) -> dict | None:
+    if response is None:
+        return None
+    return {
+        name: value for name, value in response.headers.items()
+        if name not in _RENDERED_HEADERS
+    }
+
+
+def rows_response(items: list[dict], response: Response | None = None) -> Response:
+    """
+    JSON array of row dicts, encoded by orjson without building models.
+
+    For list endpoints selecting ``response_columns`` of their response schema:
+    database rows are trusted to fit it, so FastAPI's validation and
+    ``jsonable_encoder`` passes are skipped. Headers set on the injected
+    ``response`` (e.g. pagination cursors) are carried over.
+    """
+    return Response(
+        content=orjson.dumps(items),
+        media_type="application/json",
+        headers=_headers(response),
+    )
+
+
+def model_response(tp: Any, value: Any, response: Response | None = None, status_code: int = 200) -> Response:
+    """Encode already-validated models in one pass with the cached adapter for ``tp``."""
+    return Response(
+        content=type_adapter(tp).dump_json(value),
+        status_code=status_code,
+        media_type="application/json",
+        headers=_headers(response),
+    )
@@ -1,19 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
+from app.core.security import shutdown_password_hasher
 from app.api.routes import auth, admin, employee, common
-from app.core.database import engine, Base
+from app.services.notification_hub import notification_hub
+from app.services.notification_service import notification_dispatcher
+from app.services.file_renditions import shutdown_rendition_workers
+from app.services.pdf_renderer import shutdown_pdf_renderer
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+# Database tables are managed by Alembic: run `alembic upgrade head` before starting.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await notification_hub.start()
+    notification_dispatcher.start()
+    yield
+    await notification_dispatcher.stop()
+    await notification_hub.stop()
+    shutdown_pdf_renderer()
+    shutdown_password_hasher()
+    shutdown_rendition_workers()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Payroll Management System API",
     description="A comprehensive payroll management system API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -23,11 +43,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-# Mount static files for uploads
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(admin.router, prefix="/admin", tags=["Admin"])
@@ -1,7 +1,10 @@
 from app.models.user import User
 from app.models.salary_slip import SalarySlip
 from app.models.expense import Expense
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationCounter, NotificationOutbox, NotificationStreamTicket
+from app.models.payroll_aggregate import PayrollMonthlyAggregate
+from app.models.payroll_run import PayrollRun
+from app.models.uploaded_file import UploadedFile
 
-__all__ = ["User", "SalarySlip", "Expense", "Notification"]
+__all__ = ["User", "SalarySlip", "Expense", "Notification", "NotificationCounter", "NotificationOutbox", "NotificationStreamTicket", "PayrollMonthlyAggregate", "PayrollRun", "UploadedFile"]
 
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Float
+from app.core.database import Base
+
+
+class PayrollMonthlyAggregate(Base):
+    """Running totals of salary slips per period, department and status."""
+
+    __tablename__ = "payroll_monthly_aggregates"
+
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    department = Column(String, primary_key=True, default="")  # "" when the employee has none
+    status = Column(String, primary_key=True)
+    slip_count = Column(Integer, nullable=False, default=0)
+    total_net_salary = Column(Float, nullable=False, default=0.0)
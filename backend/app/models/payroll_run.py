@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from datetime import datetime
+from app.core.database import Base
+
+
+class PayrollRun(Base):
+    """One company-wide (or department-wide) payroll generation and its totals."""
+
+    __tablename__ = "payroll_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    department = Column(String, nullable=True)  # None for every department
+    rules = Column(JSON, nullable=False)
+    slip_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)  # active employees left without a new slip
+    total_gross = Column(Float, nullable=False, default=0.0)
+    total_deductions = Column(Float, nullable=False, default=0.0)
+    total_tax = Column(Float, nullable=False, default=0.0)
+    total_net = Column(Float, nullable=False, default=0.0)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
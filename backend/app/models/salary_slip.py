@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -6,6 +6,10 @@ from app.core.database import Base
 
 class SalarySlip(Base):
     __tablename__ = "salary_slips"
+    __table_args__ = (
+        Index("ix_salary_slips_employee_period", "employee_id", "year", "month"),
+        Index("ix_salary_slips_status_period", "status", "year", "month"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class UploadedFile(Base):
+    """
+    A file handed out under a public name, backed by a content-addressed blob.
+
+    Identical uploads get their own public names but share one blob on disk
+    (found through ``sha256``).
+    """
+
+    __tablename__ = "uploaded_files"
+
+    name = Column(String, primary_key=True)  # "<uuid><ext>", as used in /files/{name}
+    sha256 = Column(String(64), nullable=False, index=True)
+    storage_path = Column(String, nullable=False)  # relative to the upload directory
+    size = Column(Integer, nullable=False)
+    content_type = Column(String, nullable=False)
+    original_filename = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
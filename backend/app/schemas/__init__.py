@@ -1,16 +1,25 @@
-from app.schemas.user import User, UserCreate, UserUpdate, UserResponse
+from app.schemas.user import User, UserCreate, UserUpdate, UserResponse, EmployeeSearchHit, EmployeeSearchResponse
 from app.schemas.auth import Token, TokenData, LoginRequest, SignupRequest
-from app.schemas.salary_slip import SalarySlip, SalarySlipCreate, SalarySlipUpdate, SalarySlipResponse
+from app.schemas.salary_slip import (
+    SalarySlip, SalarySlipCreate, SalarySlipUpdate, SalarySlipResponse, BulkRowError, BulkSalarySlipResult,
+    SalarySlipImportResult
+)
 from app.schemas.expense import Expense, ExpenseCreate, ExpenseUpdate, ExpenseResponse
-from app.schemas.notification import Notification, NotificationResponse
-from app.schemas.dashboard import DashboardStats, EmployeeStats
+from app.schemas.notification import (
+    Notification, NotificationResponse, UnreadCount, NotificationReadRequest, NotificationReadResult,
+    StreamTicket
+)
+from app.schemas.payroll_run import PayrollRules, PayrollRunCreate, PayrollRunResponse
+from app.schemas.dashboard import DashboardStats, EmployeeStats, ExpenseCategoryBreakdown, MonthlyExpenseBreakdown
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate", "UserResponse",
+    "User", "UserCreate", "UserUpdate", "UserResponse", "EmployeeSearchHit", "EmployeeSearchResponse",
     "Token", "TokenData", "LoginRequest", "SignupRequest",
     "SalarySlip", "SalarySlipCreate", "SalarySlipUpdate", "SalarySlipResponse",
+    "BulkRowError", "BulkSalarySlipResult", "SalarySlipImportResult",
     "Expense", "ExpenseCreate", "ExpenseUpdate", "ExpenseResponse",
-    "Notification", "NotificationResponse",
-    "DashboardStats", "EmployeeStats"
+    "Notification", "NotificationResponse", "UnreadCount", "NotificationReadRequest", "NotificationReadResult", "StreamTicket",
+    "PayrollRules", "PayrollRunCreate", "PayrollRunResponse",
+    "DashboardStats", "EmployeeStats", "ExpenseCategoryBreakdown", "MonthlyExpenseBreakdown"
 ]
 
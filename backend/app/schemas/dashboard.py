@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from app.models.expense import ExpenseCategory
 
 
 class DashboardStats(BaseModel):
@@ -11,6 +12,21 @@ class DashboardStats(BaseModel):
     monthly_payroll_summary: dict
 
 
+class ExpenseCategoryBreakdown(BaseModel):
+    category: ExpenseCategory
+    count: int
+    amount: float
+    approved_amount: float
+
+
+class MonthlyExpenseBreakdown(BaseModel):
+    year: int
+    month: int
+    count: int
+    amount: float
+    approved_amount: float
+
+
 class EmployeeStats(BaseModel):
     total_salary_slips: int
     total_expenses: int
@@ -18,4 +34,6 @@ class EmployeeStats(BaseModel):
     approved_expenses: int
     total_expense_amount: float
     total_approved_amount: float
+    monthly_breakdown: list[MonthlyExpenseBreakdown] = []  # last 12 months by expense date, oldest first
+    category_breakdown: list[ExpenseCategoryBreakdown] = []
 
@@ -23,3 +23,20 @@ class NotificationResponse(NotificationBase):
 class Notification(NotificationResponse):
     pass
 
+
+class UnreadCount(BaseModel):
+    unread_count: int
+
+
+class NotificationReadRequest(BaseModel):
+    ids: list[int]
+
+
+class NotificationReadResult(UnreadCount):
+    updated: int
+
+
+
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int  # seconds
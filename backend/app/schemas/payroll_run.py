@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class PayrollRules(BaseModel):
+    """Rates applied to every employee's basic salary in a payroll run."""
+    allowances_rate: float = Field(0.0, ge=0)  # of basic salary
+    fixed_allowances: float = Field(0.0, ge=0)  # flat amount per employee
+    deductions_rate: float = Field(0.0, ge=0, le=1)  # of gross pay
+    tax_rate: float | None = Field(None, ge=0, le=1)  # flat rate; None applies the tax brackets
+    tax_jurisdiction: str | None = None  # bracket table, defaults to TAX_JURISDICTION
+
+
+class PayrollRunCreate(BaseModel):
+    month: int = Field(..., ge=1, le=12)
+    year: int = Field(..., ge=2000, le=2100)
+    department: str | None = None
+    rules: PayrollRules = PayrollRules()
+
+
+class PayrollRunResponse(BaseModel):
+    id: int
+    year: int
+    month: int
+    department: str | None = None
+    rules: PayrollRules
+    slip_count: int
+    skipped_count: int
+    total_gross: float
+    total_deductions: float
+    total_tax: float
+    total_net: float
+    created_by: int | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -16,6 +16,7 @@ class SalarySlipBase(BaseModel):
 
 class SalarySlipCreate(SalarySlipBase):
     employee_id: int
+    tax: float | None = None  # computed from the tax brackets when omitted
 
 
 class SalarySlipUpdate(BaseModel):
@@ -46,3 +47,22 @@ class SalarySlipResponse(SalarySlipBase):
 class SalarySlip(SalarySlipResponse):
     pass
 
+
+class BulkRowError(BaseModel):
+    index: int
+    employee_id: int | None = None
+    detail: str
+
+
+class BulkSalarySlipResult(BaseModel):
+    created: list[SalarySlipResponse]
+    errors: list[BulkRowError]
+
+
+class SalarySlipImportResult(BaseModel):
+    import_id: str
+    processed: int
+    imported: int
+    failed: int
+    error_report_url: str | None = None
+
@@ -36,3 +36,15 @@ class UserResponse(UserBase):
 class User(UserResponse):
     pass
 
+
+class EmployeeSearchHit(BaseModel):
+    employee: UserResponse
+    score: float
+
+
+class EmployeeSearchResponse(BaseModel):
+    results: list[EmployeeSearchHit]
+    facets: dict[str, int]  # matches per department ("" for none)
+    total: int
+    fuzzy: bool
+
@@ -0,0 +1,207 @@
+import re
+from difflib import SequenceMatcher
+from sqlalchemy import Float, Integer, and_, column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+
+# Trigram indexes cannot match terms shorter than this.
+MIN_INDEXED_TERM_LENGTH = 3
+
+# Fuzzy matches whose terms are on average less similar than this are discarded.
+FUZZY_SIMILARITY_THRESHOLD = 0.7
+
+# Candidates fetched from the index before fuzzy matches are re-scored.
+FUZZY_CANDIDATE_LIMIT = 500
+
+# SQLite FTS5 external-content table created by migration 0005.
+users_search = table("users_search", column("rowid", Integer), column("rank", Float))
+
+_TERM_PATTERN = re.compile(r"[^\W_]+(?:[.@'-][^\W_]+)*")
+
+
+def _terms(query: str) -> list[str]:
+    return _TERM_PATTERN.findall(query.lower())
+
+
+def _trigrams(word: str) -> set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def _fuzzy_trigrams(terms: list[str]) -> list[str]:
+    """
+    Trigrams of each term and of its single-character deletions.
+
+    Deletion variants make candidates reachable despite a transposed,
+    substituted or extra letter ("smtih" -> "smih" -> "smi" finds "smith").
+    """
+    trigrams = set()
+    for term in terms:
+        trigrams |= _trigrams(term)
+        for i in range(len(term)):
+            trigrams |= _trigrams(term[:i] + term[i + 1:])
+    return sorted(trigrams)
+
+
+def term_similarity(term: str, text_value: str) -> float:
+    """Best similarity (0..1) of ``term`` to any word, or word prefix, of ``text_value``."""
+    best = 0.0
+    for word in re.split(r"[\s@.]+", text_value.lower()):
+        if word:
+            best = max(
+                best,
+                SequenceMatcher(None, term, word).ratio(),
+                # Prefix matches count slightly less than whole-word ones.
+                0.9 * SequenceMatcher(None, term, word[:len(term)]).ratio(),
+            )
+    return best
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _sqlite_match(terms: list[str], fuzzy: bool) -> str:
+    """FTS5 trigram query: every term as a substring, or any of their fuzzy trigrams."""
+    if not fuzzy:
+        return " AND ".join(_fts_phrase(term) for term in terms)
+    return " OR ".join(_fts_phrase(trigram) for trigram in _fuzzy_trigrams(terms))
+
+
+def _search_text():
+    # Must match the expression indexed by ix_users_search_trgm.
+    return func.lower(User.full_name + literal_column("' '") + User.email)
+
+
+def employee_search_filter(db: AsyncSession, query: str):
+    """
+    WHERE clause matching users whose name or email contains every query term.
+
+    Uses the search index (FTS5 on SQLite, pg_trgm on Postgres) for terms of
+    three characters or more; shorter terms fall back to prefix matching.
+    """
+    terms = _terms(query)
+    if not terms:
+        return User.full_name.ilike(f"%{query}%")
+
+    long_terms = [term for term in terms if len(term) >= MIN_INDEXED_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_INDEXED_TERM_LENGTH]
+    clauses = [
+        or_(User.full_name.ilike(f"{term}%"), User.full_name.ilike(f"% {term}%"), User.email.ilike(f"{term}%"))
+        for term in short_terms
+    ]
+
+    if long_terms:
+        if db.bind.dialect.name == "sqlite":
+            clauses.append(User.id.in_(
+                select(users_search.c.rowid).where(
+                    text("users_search MATCH :match").bindparams(match=_sqlite_match(long_terms, fuzzy=False))
+                )
+            ))
+        else:
+            search_text = _search_text()
+            clauses.extend(search_text.like(f"%{term}%") for term in long_terms)
+
+    return and_(*clauses)
+
+
+def _matched(db: AsyncSession, terms: list[str], fuzzy: bool):
+    """Subquery of ``(id, score)`` for users matching the terms; higher scores rank first."""
+    if db.bind.dialect.name == "sqlite":
+        # bm25 ranks are negative with lower meaning better.
+        return (
+            select(users_search.c.rowid.label("id"), (-users_search.c.rank).label("score"))
+            .where(text("users_search MATCH :match").bindparams(match=_sqlite_match(terms, fuzzy)))
+            .subquery()
+        )
+    search_text = _search_text()
+    phrase = " ".join(terms)
+    if fuzzy:
+        condition = or_(*(search_text.like(f"%{trigram}%") for trigram in _fuzzy_trigrams(terms)))
+    else:
+        condition = and_(*(search_text.like(f"%{term}%") for term in terms))
+    return (
+        select(User.id.label("id"), func.word_similarity(phrase, search_text).label("score"))
+        .where(condition)
+        .subquery()
+    )
+
+
+async def search_employees(
+    db: AsyncSession,
+    query: str,
+    department: str | None = None,
+    limit: int = 20,
+) -> dict:
+    """
+    Ranked employee search with department facet counts.
+
+    Substring (and so prefix) matches on name and email are tried first,
+    ranked by the index (bm25 on SQLite, word similarity on Postgres). If
+    there are none the search turns fuzzy: index candidates sharing trigrams
+    with the query (or its one-letter deletions) are re-scored by string
+    similarity, so small typos still match; fuzzy facets and totals only
+    cover those FUZZY_CANDIDATE_LIMIT candidates. Facet counts ignore the
+    ``department`` filter so the UI can offer every department with matches.
+    """
+    terms = [term for term in _terms(query) if len(term) >= MIN_INDEXED_TERM_LENGTH]
+    if terms:
+        matched = _matched(db, terms, fuzzy=False)
+    else:
+        # Too short for the trigram index: unranked prefix matching.
+        matched = (
+            select(User.id.label("id"), literal(0.0).label("score"))
+            .where(employee_search_filter(db, query))
+            .subquery()
+        )
+
+    facet_rows = (await db.execute(
+        select(User.department, func.count())
+        .join(matched, matched.c.id == User.id)
+        .where(User.role == "employee")
+        .group_by(User.department)
+    )).all()
+    if facet_rows or not terms:
+        results_query = (
+            select(User, matched.c.score)
+            .join(matched, matched.c.id == User.id)
+            .where(User.role == "employee")
+            .order_by(matched.c.score.desc(), User.id)
+            .limit(limit)
+        )
+        if department:
+            results_query = results_query.where(User.department == department)
+        matches = (await db.execute(results_query)).all()
+        facets = {dept or "": count for dept, count in facet_rows}
+        return _search_result(matches, facets, department, fuzzy=False)
+
+    fuzzy_matched = _matched(db, terms, fuzzy=True)
+    candidates = (await db.scalars(
+        select(User)
+        .join(fuzzy_matched, fuzzy_matched.c.id == User.id)
+        .where(User.role == "employee")
+        .order_by(fuzzy_matched.c.score.desc(), User.id)
+        .limit(FUZZY_CANDIDATE_LIMIT)
+    )).all()
+    matches = []
+    for user in candidates:
+        haystack = f"{user.full_name} {user.email}"
+        similarity = sum(term_similarity(term, haystack) for term in terms) / len(terms)
+        if similarity >= FUZZY_SIMILARITY_THRESHOLD:
+            matches.append((user, similarity))
+    matches.sort(key=lambda match: (-match[1], match[0].id))
+
+    facets: dict[str, int] = {}
+    for user, _ in matches:
+        facets[user.department or ""] = facets.get(user.department or "", 0) + 1
+    if department:
+        matches = [match for match in matches if match[0].department == department]
+    return _search_result(matches[:limit], facets, department, fuzzy=True)
+
+
+def _search_result(matches, facets: dict[str, int], department: str | None, fuzzy: bool) -> dict:
+    return {
+        "results": [{"employee": user, "score": float(score)} for user, score in matches],
+        "facets": dict(sorted(facets.items(), key=lambda item: (-item[1], item[0]))),
+        "total": facets.get(department, 0) if department else sum(facets.values()),
+        "fuzzy": fuzzy,
+    }
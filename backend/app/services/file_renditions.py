@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bounding boxes of the generated renditions; aspect ratio is preserved.
+RENDITION_SIZES = {
+    "thumb": (240, 240),
+    "preview": (1280, 1280),
+}
+
+# Output formats, best first; WebP is served to clients that accept it.
+RENDITION_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.RENDITION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def is_image(path: Path) -> bool:
+    return path.suffix.lower() in IMAGE_EXTENSIONS
+
+
+def rendition_path(source: Path, size: str, fmt: str) -> Path:
+    """Rendition stored next to its original, e.g. <sha256>.thumb.webp."""
+    return source.with_name(f"{source.stem}.{size}.{fmt}")
+
+
+def _render_all(source: str) -> list[str]:
+    """Write every missing size/format rendition of an image (runs in a worker process)."""
+    from PIL import Image, ImageOps
+
+    source_path = Path(source)
+    pending = [
+        (size, fmt) for size in RENDITION_SIZES for fmt in RENDITION_FORMATS
+        if not rendition_path(source_path, size, fmt).exists()
+    ]
+    if not pending:
+        return []
+
+    written = []
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        if image.mode == "RGBA":
+            # JPEG has no alpha channel: flatten onto white.
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+
+        for size in dict.fromkeys(size for size, _ in pending):
+            resized = image.copy()
+            resized.thumbnail(RENDITION_SIZES[size], Image.LANCZOS)
+            for fmt, (pil_format, _, options) in RENDITION_FORMATS.items():
+                if (size, fmt) not in pending:
+                    continue
+                target = rendition_path(source_path, size, fmt)
+                fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=f".{fmt}")
+                try:
+                    with os.fdopen(fd, "wb") as out:
+                        resized.save(out, pil_format, **options)
+                    os.replace(tmp_path, target)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                written.append(str(target))
+    return written
+
+
+async def generate_renditions(source: Path):
+    """Render thumbnail and preview versions of an uploaded image in the worker pool."""
+    if not is_image(source):
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_get_executor(), _render_all, str(source.resolve()))
+    except Exception:
+        logger.exception("Could not render renditions for %s", source.name)
+
+
+async def get_rendition(source: Path, size: str, accept: str) -> tuple[Path, str] | None:
+    """
+    Path and media type of an image rendition, rendering it now if missing.
+
+    Picks WebP when the client's Accept header allows it, JPEG otherwise.
+    Returns None for files that are not images.
+    """
+    if not is_image(source):
+        return None
+    fmt = "webp" if "image/webp" in accept else "jpg"
+    path = rendition_path(source, size, fmt)
+    if not path.exists():
+        # Uploads from before renditions existed, or a render still in flight.
+        await generate_renditions(source)
+        if not path.exists():
+            return None
+    return path, RENDITION_FORMATS[fmt][1]
+
+
+def shutdown_rendition_workers():
+    """Stop the rendition worker processes."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
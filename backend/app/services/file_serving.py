@@ -0,0 +1,156 @@
+import mimetypes
+import os
+import re
+from pathlib import Path
+from urllib.parse import quote
+import anyio
+from fastapi import Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from app.core.config import settings
+from app.services.file_storage import UPLOAD_DIR
+
+# Upload names are random and their content never changes, so clients may keep them forever.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def stat_etag(stat_result: os.stat_result) -> str:
+    """Strong ETag for files without a recorded hash; safe because uploads are never rewritten."""
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def guess_media_type(filename: str) -> str:
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored."""
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in header.split(",")
+    )
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Inclusive (start, end) of a single ``bytes=`` range.
+
+    Returns None for headers that should be ignored (malformed or multiple
+    ranges; the whole file is served instead) and raises ValueError for
+    ranges that lie entirely outside the file.
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the final N bytes.
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError("empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("range starts past the end of the file")
+    return start, end
+
+
+async def _read_range(path: Path, start: int, end: int):
+    async with await anyio.open_file(path, mode="rb") as file:
+        await file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await file.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"inline; filename*=utf-8''{quoted}"
+    return f'inline; filename="{filename}"'
+
+
+def _sendfile_header(path: Path) -> tuple[str, str] | None:
+    """Header handing the transfer to the front proxy, if one is configured."""
+    if settings.FILE_SENDFILE_HEADER == "X-Accel-Redirect":
+        relative = path.resolve().relative_to(UPLOAD_DIR.resolve()).as_posix()
+        return "X-Accel-Redirect", settings.FILE_SENDFILE_PREFIX.rstrip("/") + "/" + quote(relative)
+    if settings.FILE_SENDFILE_HEADER == "X-Sendfile":
+        return "X-Sendfile", str(path.resolve())
+    return None
+
+
+async def file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    etag: str | None = None,
+    filename: str | None = None,
+    vary: str | None = None,
+) -> Response:
+    """
+    Serve an immutable file with caching, conditional and range support.
+
+    Sends a strong ETag (``stat_etag`` unless the caller knows a content hash)
+    and a year-long immutable Cache-Control, answers a matching
+    If-None-Match with an empty 304, and a single ``Range`` with 206 (416
+    when unsatisfiable; If-Range is honoured). With FILE_SENDFILE_HEADER set
+    the body is left to the front proxy (nginx X-Accel-Redirect or
+    X-Sendfile), which sends it with sendfile(2) and handles ranges itself.
+    """
+    stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    headers = {
+        "ETag": etag or stat_etag(stat_result),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if vary:
+        headers["Vary"] = vary
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename)
+
+    sendfile = _sendfile_header(path)
+    if sendfile is not None:
+        headers[sendfile[0]] = sendfile[1]
+        return Response(media_type=media_type, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == headers["ETag"]):
+        size = stat_result.st_size
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                _read_range(path, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers=headers,
+            )
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
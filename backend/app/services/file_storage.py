@@ -0,0 +1,107 @@
+import hashlib
+import mimetypes
+import os
+import tempfile
+import uuid
+from pathlib import Path
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.uploaded_file import UploadedFile
+
+UPLOAD_DIR = Path("uploads")
+OBJECTS_DIR = UPLOAD_DIR / "objects"
+TMP_DIR = UPLOAD_DIR / "tmp"
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def blob_relative_path(sha256: str, ext: str) -> str:
+    """Sharded location of a blob, e.g. objects/ab/cd/abcd...ef.pdf."""
+    return f"objects/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+def _move_into_place(tmp_path: str, blob_path: Path):
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_path, blob_path)
+
+
+def _discard(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _spool_upload(file: UploadFile, max_size: int) -> tuple[str, str, int]:
+    """Copy an upload to a temp file chunk by chunk; returns (temp path, sha256, size)."""
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=TMP_DIR)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File size exceeds {max_size // (1024 * 1024)}MB limit"
+                    )
+                hasher.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    return tmp_path, hasher.hexdigest(), size
+
+
+async def store_upload(db: AsyncSession, file: UploadFile, ext: str, max_size: int) -> UploadedFile:
+    """
+    Store an upload under a new public name, deduplicating its content.
+
+    The body is hashed while it is streamed to a temp file, and the copy is
+    abandoned as soon as it exceeds ``max_size``. If a blob with the same
+    SHA-256 already exists it is reused and the temp file is dropped, so
+    identical receipts take no extra disk.
+    """
+    tmp_path, sha256, size = await _spool_upload(file, max_size)
+    try:
+        storage_path = await db.scalar(
+            select(UploadedFile.storage_path).where(UploadedFile.sha256 == sha256).limit(1)
+        )
+        if storage_path is None or not (UPLOAD_DIR / storage_path).exists():
+            storage_path = blob_relative_path(sha256, ext)
+            await run_in_threadpool(_move_into_place, tmp_path, UPLOAD_DIR / storage_path)
+    finally:
+        _discard(tmp_path)
+
+    record = UploadedFile(
+        name=f"{uuid.uuid4()}{ext}",
+        sha256=sha256,
+        storage_path=storage_path,
+        size=size,
+        content_type=mimetypes.guess_type(f"file{ext}")[0] or "application/octet-stream",
+        original_filename=file.filename,
+    )
+    db.add(record)
+    await db.commit()
+    return record
+
+
+async def resolve_upload_path(db: AsyncSession, name: str) -> tuple[Path, UploadedFile | None] | None:
+    """
+    Find the file on disk for a public upload name.
+
+    Names recorded in ``uploaded_files`` map to their blob; files uploaded
+    before content addressing are still served from the flat upload dir.
+    """
+    record = await db.get(UploadedFile, name)
+    if record is not None:
+        return UPLOAD_DIR / record.storage_path, record
+
+    legacy_path = UPLOAD_DIR / name
+    if Path(name).name != name or not legacy_path.is_file():
+        return None
+    return legacy_path, None
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Callable
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per connection before a slow client starts losing them.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Pushed to every subscriber queue on shutdown so open streams finish.
+CLOSE_STREAM = None
+
+
+class NotificationBroker:
+    """Fan-out transport between the workers' hubs."""
+
+    async def start(self, deliver: Callable[[dict], None]):
+        raise NotImplementedError
+
+    async def publish(self, messages: list[dict]):
+        raise NotImplementedError
+
+    async def stop(self):
+        pass
+
+
+class LocalNotificationBroker(NotificationBroker):
+    """In-process stand-in: messages only reach subscribers of this worker."""
+
+    async def start(self, deliver: Callable[[dict], None]):
+        self._deliver = deliver
+
+    async def publish(self, messages: list[dict]):
+        for message in messages:
+            self._deliver(message)
+
+
+class PostgresNotificationBroker(NotificationBroker):
+    """Relays messages between workers with PostgreSQL LISTEN/NOTIFY."""
+
+    def __init__(self, database_url: str, channel: str = "payroll_notifications"):
+        url = make_url(database_url).set(drivername="postgresql")
+        self.dsn = url.render_as_string(hide_password=False)
+        self.channel = channel
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, deliver: Callable[[dict], None]):
+        import asyncpg
+
+        self._deliver = deliver
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._deliver(json.loads(payload))
+
+    async def publish(self, messages: list[dict]):
+        if not messages:
+            return
+        payloads = [json.dumps(message, separators=(",", ":")) for message in messages]
+        # One round trip per batch; asyncpg allows one operation at a time per connection.
+        async with self._lock:
+            await self._conn.execute(
+                "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+                self.channel, payloads,
+            )
+
+    async def stop(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class NotificationHub:
+    """
+    In-process pub/sub of delivered notifications, keyed by user id.
+
+    Each open stream holds a bounded queue; publishing goes through the
+    broker so that every worker's subscribers see every notification.
+    """
+
+    def __init__(self, broker: NotificationBroker):
+        self.broker = broker
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+
+    async def start(self):
+        await self.broker.start(self._deliver)
+
+    async def stop(self):
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(CLOSE_STREAM)
+        await self.broker.stop()
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def _deliver(self, message: dict):
+        for queue in self._subscribers.get(message["user_id"], ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("Dropping notification %s for a slow stream", message.get("id"))
+
+    async def publish(self, messages: list[dict]):
+        """Publish serialized notifications to every worker's subscribers."""
+        try:
+            await self.broker.publish(messages)
+        except Exception:
+            # Streams are best effort; notifications are already stored.
+            logger.exception("Notification publish failed")
+
+    def stats(self) -> dict:
+        return {
+            "broker": type(self.broker).__name__,
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+
+def _build_broker() -> NotificationBroker:
+    if settings.NOTIFICATION_BROKER == "postgres":
+        return PostgresNotificationBroker(settings.DATABASE_URL)
+    if settings.NOTIFICATION_BROKER == "local":
+        return LocalNotificationBroker()
+    raise ValueError(f"Unknown NOTIFICATION_BROKER '{settings.NOTIFICATION_BROKER}'")
+
+
+notification_hub = NotificationHub(_build_broker())
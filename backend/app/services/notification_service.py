@@ -1,26 +1,277 @@
-from sqlalchemy.orm import Session
-from app.models.notification import Notification, NotificationType
+import asyncio
+import hashlib
+import logging
+import secrets
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, upsert_insert
+from app.models.notification import Notification, NotificationCounter, NotificationOutbox, NotificationStreamTicket, NotificationType
+from app.schemas.notification import NotificationResponse
+from app.services.notification_hub import notification_hub
 
+# Most notifications replayed to a stream reconnecting with Last-Event-ID.
+STREAM_REPLAY_LIMIT = 100
 
-def create_notification(
-    db: Session,
+logger = logging.getLogger(__name__)
+
+
+async def create_notifications(db: AsyncSession, notifications: list[dict]):
+    """
+    Queue notifications in the caller's transaction.
+
+    Each item holds ``user_id``, ``type``, ``title``, ``message`` and an
+    optional ``link``. Rows go to the outbox with a single executemany and
+    are only delivered once the caller commits, so nothing is sent for
+    rolled-back work. Nothing is committed here.
+    """
+    if not notifications:
+        return
+    await db.execute(insert(NotificationOutbox.__table__), [
+        {
+            "user_id": notification["user_id"],
+            "type": notification["type"],
+            "title": notification["title"],
+            "message": notification["message"],
+            "link": notification.get("link"),
+        }
+        for notification in notifications
+    ])
+
+
+async def create_notification(
+    db: AsyncSession,
     user_id: int,
     type: NotificationType,
     title: str,
     message: str,
     link: str | None = None
 ):
-    """Create a new notification."""
-    notification = Notification(
+    """Queue a single notification in the caller's transaction."""
+    await create_notifications(db, [
+        {"user_id": user_id, "type": type, "title": title, "message": message, "link": link}
+    ])
+
+
+async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+    """Read a user's unread count from the counter table."""
+    return await db.scalar(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    ) or 0
+
+
+async def _increment_unread_counts(db: AsyncSession, counts: Counter):
+    table = NotificationCounter.__table__
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"unread_count": table.c.unread_count + stmt.excluded.unread_count},
+    )
+    await db.execute(stmt, [
+        {"user_id": user_id, "unread_count": count} for user_id, count in counts.items()
+    ])
+
+
+async def mark_notifications_read(
+    db: AsyncSession,
+    user_id: int,
+    notification_ids: list[int] | None = None
+) -> int:
+    """
+    Mark a user's unread notifications read with one UPDATE; returns how many changed.
+
+    Marks all of them, or only ``notification_ids`` when given. Marking all
+    resets the unread counter to the true count (zero, bar concurrent
+    deliveries), which also repairs a counter that drifted; otherwise it is
+    lowered by the number of rows actually flipped, never below zero.
+    Nothing is committed.
+    """
+    stmt = update(Notification).where(
+        Notification.user_id == user_id,
+        Notification.is_read == False
+    )
+    if notification_ids is not None:
+        stmt = stmt.where(Notification.id.in_(notification_ids))
+    updated = (await db.execute(stmt.values(is_read=True))).rowcount
+
+    counter = update(NotificationCounter).where(NotificationCounter.user_id == user_id)
+    if notification_ids is None:
+        await db.execute(counter.values(unread_count=_unread_notifications(user_id)))
+    elif updated:
+        await db.execute(counter.values(unread_count=case(
+            (NotificationCounter.unread_count > updated, NotificationCounter.unread_count - updated),
+            else_=0,
+        )))
+    return updated
+
+
+def _unread_notifications(user_id: int):
+    return (
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+        .scalar_subquery()
+    )
+
+
+async def rebuild_notification_counters(db: AsyncSession) -> int:
+    """Recompute every unread counter from notifications; returns the number of counters."""
+    table = NotificationCounter.__table__
+    await db.execute(delete(table))
+    await db.execute(
+        insert(table).from_select(
+            ["user_id", "unread_count"],
+            select(Notification.user_id, func.count())
+            .where(Notification.is_read == False)
+            .group_by(Notification.user_id),
+        )
+    )
+    return await db.scalar(select(func.count()).select_from(table))
+
+
+async def get_notifications_after(db: AsyncSession, user_id: int, last_id: int) -> list[dict]:
+    """
+    A user's notifications newer than ``last_id``, serialized like published ones.
+
+    Lets a reconnecting stream replay what it missed (up to
+    STREAM_REPLAY_LIMIT, oldest first).
+    """
+    notifications = (await db.scalars(
+        select(Notification)
+        .where(Notification.user_id == user_id, Notification.id > last_id)
+        .order_by(Notification.id)
+        .limit(STREAM_REPLAY_LIMIT)
+    )).all()
+    return [
+        NotificationResponse.model_validate(notification).model_dump(mode="json")
+        for notification in notifications
+    ]
+
+
+def _ticket_hash(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode()).hexdigest()
+
+
+async def issue_stream_ticket(db: AsyncSession, user_id: int) -> str:
+    """
+    Create a single-use ticket for opening a user's notification stream.
+
+    EventSource cannot send an Authorization header, so the ticket goes in the
+    query string instead of the access token; only its digest is stored, and
+    expired tickets are purged here. Nothing is committed.
+    """
+    now = datetime.utcnow()
+    await db.execute(delete(NotificationStreamTicket).where(NotificationStreamTicket.expires_at <= now))
+    ticket = secrets.token_urlsafe(32)
+    await db.execute(insert(NotificationStreamTicket.__table__).values(
+        ticket_hash=_ticket_hash(ticket),
         user_id=user_id,
-        type=type,
-        title=title,
-        message=message,
-        link=link,
-        is_read=False
+        expires_at=now + timedelta(seconds=settings.NOTIFICATION_STREAM_TICKET_SECONDS),
+    ))
+    return ticket
+
+
+async def redeem_stream_ticket(db: AsyncSession, ticket: str) -> int | None:
+    """
+    Consume a stream ticket and return its user id, or None if it is unknown or expired.
+
+    The claim is a single DELETE ... RETURNING, so a ticket opens one stream
+    even with several workers. Nothing is committed.
+    """
+    return await db.scalar(
+        delete(NotificationStreamTicket)
+        .where(
+            NotificationStreamTicket.ticket_hash == _ticket_hash(ticket),
+            NotificationStreamTicket.expires_at > datetime.utcnow(),
+        )
+        .returning(NotificationStreamTicket.user_id)
     )
-    
-    db.add(notification)
-    db.commit()
-    return notification
 
+
+OUTBOX_COLUMNS = (
+    NotificationOutbox.id,
+    NotificationOutbox.user_id,
+    NotificationOutbox.type,
+    NotificationOutbox.title,
+    NotificationOutbox.message,
+    NotificationOutbox.link,
+    NotificationOutbox.created_at,
+)
+
+
+async def dispatch_notification_outbox(batch_size: int) -> int:
+    """
+    Move up to ``batch_size`` outbox rows into notifications; returns how many moved.
+
+    The claim (DELETE ... RETURNING), the insert and the unread counter
+    increments share one transaction, so a row is delivered exactly once even
+    with several dispatchers running. Delivered notifications are then
+    published to open notification streams.
+    """
+    async with AsyncSessionLocal() as db:
+        claimed = select(NotificationOutbox.id).order_by(NotificationOutbox.id).limit(batch_size)
+        rows = (await db.execute(
+            delete(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(claimed.scalar_subquery()))
+            .returning(*OUTBOX_COLUMNS)
+        )).all()
+        if not rows:
+            return 0
+        delivered = (await db.scalars(insert(Notification).returning(Notification), [
+            {
+                "user_id": row.user_id,
+                "type": row.type,
+                "title": row.title,
+                "message": row.message,
+                "link": row.link,
+                "is_read": False,
+                "created_at": row.created_at,
+            }
+            for row in sorted(rows, key=lambda row: row.id)
+        ])).all()
+        await _increment_unread_counts(db, Counter(row.user_id for row in rows))
+        await db.commit()
+    await notification_hub.publish([
+        NotificationResponse.model_validate(notification).model_dump(mode="json")
+        for notification in delivered
+    ])
+    return len(rows)
+
+
+class NotificationDispatcher:
+    """Background task that drains the notification outbox."""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            try:
+                # Keep draining while full batches come back, then wait for more.
+                while await dispatch_notification_outbox(self.batch_size) == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("Notification dispatch failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+notification_dispatcher = NotificationDispatcher(
+    settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS, settings.NOTIFICATION_DISPATCH_BATCH_SIZE
+)
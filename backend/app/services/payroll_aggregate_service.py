@@ -0,0 +1,122 @@
+from collections import defaultdict
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import upsert_insert
+from app.models.payroll_aggregate import PayrollMonthlyAggregate
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+
+AggregateKey = tuple[int, int, str, str]
+
+
+class PayrollAggregateDeltas:
+    """Accumulates slip count/net salary changes per aggregate bucket."""
+
+    def __init__(self):
+        self._deltas: dict[AggregateKey, list] = defaultdict(lambda: [0, 0.0])
+
+    def add(self, year: int, month: int, department: str | None, status: str, net_salary: float, sign: int = 1):
+        bucket = self._deltas[(year, month, department or "", status or "pending")]
+        bucket[0] += sign
+        bucket[1] += sign * (net_salary or 0.0)
+
+    def add_slip(self, slip: SalarySlip, department: str | None, sign: int = 1):
+        self.add(slip.year, slip.month, department, slip.status, slip.net_salary, sign)
+
+    def add_totals(self, year: int, month: int, department: str | None, status: str, count: int, net_salary: float):
+        """Add ``count`` slips totalling ``net_salary`` to one bucket at once."""
+        bucket = self._deltas[(year, month, department or "", status or "pending")]
+        bucket[0] += count
+        bucket[1] += net_salary
+
+    def rows(self) -> list[dict]:
+        return [
+            {
+                "year": year,
+                "month": month,
+                "department": department,
+                "status": status,
+                "slip_count": count,
+                "total_net_salary": amount,
+            }
+            for (year, month, department, status), (count, amount) in self._deltas.items()
+            if count or amount
+        ]
+
+
+async def apply_payroll_aggregate_deltas(db: AsyncSession, deltas: PayrollAggregateDeltas):
+    """Upsert accumulated deltas in the caller's transaction (no commit)."""
+    rows = deltas.rows()
+    if not rows:
+        return
+
+    table = PayrollMonthlyAggregate.__table__
+    stmt = upsert_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.year, table.c.month, table.c.department, table.c.status],
+        set_={
+            "slip_count": table.c.slip_count + stmt.excluded.slip_count,
+            "total_net_salary": table.c.total_net_salary + stmt.excluded.total_net_salary,
+        },
+    )
+    await db.execute(stmt, rows)
+
+
+async def move_employee_aggregates(
+    db: AsyncSession,
+    employee_id: int,
+    old_department: str | None,
+    new_department: str | None,
+):
+    """
+    Move an employee's slips from their old department's buckets to the new one's.
+
+    Aggregates are keyed on the employee's current department, so this must
+    run in the transaction that changes it. Nothing is committed.
+    """
+    if (old_department or "") == (new_department or ""):
+        return
+
+    status = func.coalesce(SalarySlip.status, "pending")
+    totals = (await db.execute(
+        select(
+            SalarySlip.year,
+            SalarySlip.month,
+            status,
+            func.count(SalarySlip.id),
+            func.coalesce(func.sum(SalarySlip.net_salary), 0.0),
+        )
+        .where(SalarySlip.employee_id == employee_id)
+        .group_by(SalarySlip.year, SalarySlip.month, status)
+    )).all()
+
+    deltas = PayrollAggregateDeltas()
+    for year, month, slip_status, count, total in totals:
+        deltas.add_totals(year, month, old_department, slip_status, -count, -total)
+        deltas.add_totals(year, month, new_department, slip_status, count, total)
+    await apply_payroll_aggregate_deltas(db, deltas)
+
+
+async def rebuild_payroll_aggregates(db: AsyncSession) -> int:
+    """Recompute every aggregate row from salary_slips; returns the bucket count."""
+    table = PayrollMonthlyAggregate.__table__
+    department = func.coalesce(User.department, "")
+    status = func.coalesce(SalarySlip.status, "pending")
+
+    await db.execute(delete(table))
+    await db.execute(
+        insert(table).from_select(
+            ["year", "month", "department", "status", "slip_count", "total_net_salary"],
+            select(
+                SalarySlip.year,
+                SalarySlip.month,
+                department,
+                status,
+                func.count(SalarySlip.id),
+                func.coalesce(func.sum(SalarySlip.net_salary), 0.0),
+            )
+            .join(User, User.id == SalarySlip.employee_id)
+            .group_by(SalarySlip.year, SalarySlip.month, department, status),
+        )
+    )
+    return await db.scalar(select(func.count()).select_from(table))
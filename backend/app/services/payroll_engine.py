@@ -0,0 +1,150 @@
+import numpy as np
+from sqlalchemy import and_, exists, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.payroll_run import PayrollRun
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+from app.schemas.payroll_run import PayrollRules, PayrollRunCreate
+from app.services.notification_service import create_notifications
+from app.services.payroll_aggregate_service import PayrollAggregateDeltas, apply_payroll_aggregate_deltas
+from app.services.salary_slip_service import net_salary, salary_slip_notification, taxable_pay
+from app.services.tax_engine import monthly_tax_batch
+
+# Slips (and their notifications) are written this many rows per statement.
+INSERT_CHUNK_SIZE = 10000
+
+
+def compute_payroll(basic_salary: np.ndarray, rules: PayrollRules, year: int) -> dict[str, np.ndarray]:
+    """
+    Pay components for a whole batch of employees at once, rounded to cents.
+
+    Allowances are a rate of basic salary plus a flat amount and deductions a
+    rate of gross pay. Tax is levied on gross pay after deductions, through
+    the year's tax brackets unless the rules set a flat rate.
+    """
+    allowances = np.round(basic_salary * rules.allowances_rate + rules.fixed_allowances, 2)
+    gross = basic_salary + allowances
+    deductions = np.round(gross * rules.deductions_rate, 2)
+    taxable = taxable_pay(basic_salary, allowances, deductions)
+    if rules.tax_rate is None:
+        tax = monthly_tax_batch(taxable, year, rules.tax_jurisdiction)
+    else:
+        tax = np.round(taxable * rules.tax_rate, 2)
+    return {
+        "basic_salary": basic_salary,
+        "allowances": allowances,
+        "gross": gross,
+        "deductions": deductions,
+        "tax": tax,
+        "net_salary": np.round(net_salary(basic_salary, allowances, deductions, tax), 2),
+    }
+
+
+def _in_scope(department: str | None) -> list:
+    conditions = [User.role == "employee", User.is_active == True]
+    if department:
+        conditions.append(User.department == department)
+    return conditions
+
+
+async def load_compensation(
+    db: AsyncSession,
+    year: int,
+    month: int,
+    department: str | None = None,
+) -> tuple[np.ndarray, list[str], np.ndarray]:
+    """
+    Employee ids, departments and basic salaries for a payroll run.
+
+    Compensation is the basic salary of each active employee's latest slip.
+    Employees who never had a slip, or already have one for the period, are
+    left out. Everything comes back in one query.
+    """
+    latest = select(
+        SalarySlip.employee_id,
+        SalarySlip.basic_salary,
+        func.row_number().over(
+            partition_by=SalarySlip.employee_id,
+            order_by=(SalarySlip.year.desc(), SalarySlip.month.desc(), SalarySlip.id.desc()),
+        ).label("recency"),
+    ).subquery()
+    already_paid = exists().where(
+        SalarySlip.employee_id == User.id, SalarySlip.year == year, SalarySlip.month == month
+    )
+    rows = (await db.execute(
+        select(User.id, User.department, latest.c.basic_salary)
+        .join(latest, and_(latest.c.employee_id == User.id, latest.c.recency == 1))
+        .where(*_in_scope(department), ~already_paid)
+        .order_by(User.id)
+    )).all()
+
+    employee_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    departments = [row[1] or "" for row in rows]
+    basic_salary = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    return employee_ids, departments, basic_salary
+
+
+async def run_payroll(db: AsyncSession, run_in: PayrollRunCreate, created_by: int | None) -> tuple[PayrollRun, list[int]]:
+    """
+    Generate a period's salary slips for every in-scope active employee.
+
+    Pay is computed for the whole batch with NumPy, then slips, outbox
+    notifications and payroll aggregates are written with multi-row
+    statements. Returns the run record and the employees paid. Nothing is
+    committed.
+    """
+    employee_ids, departments, basic_salary = await load_compensation(
+        db, run_in.year, run_in.month, run_in.department
+    )
+    pay = compute_payroll(basic_salary, run_in.rules, run_in.year)
+    in_scope = await db.scalar(select(func.count()).select_from(User).where(*_in_scope(run_in.department)))
+
+    run = PayrollRun(
+        year=run_in.year,
+        month=run_in.month,
+        department=run_in.department,
+        rules=run_in.rules.model_dump(),
+        slip_count=len(employee_ids),
+        skipped_count=in_scope - len(employee_ids),
+        total_gross=round(float(pay["gross"].sum()), 2),
+        total_deductions=round(float(pay["deductions"].sum()), 2),
+        total_tax=round(float(pay["tax"].sum()), 2),
+        total_net=round(float(pay["net_salary"].sum()), 2),
+        created_by=created_by,
+    )
+    db.add(run)
+    await db.flush()
+
+    paid_ids = employee_ids.tolist()
+    columns = {
+        name: pay[name].tolist()
+        for name in ("basic_salary", "allowances", "deductions", "tax", "net_salary")
+    }
+    notes = f"Payroll run #{run.id}"
+    for start in range(0, len(paid_ids), INSERT_CHUNK_SIZE):
+        chunk = range(start, min(start + INSERT_CHUNK_SIZE, len(paid_ids)))
+        await db.execute(insert(SalarySlip.__table__), [
+            {
+                "employee_id": paid_ids[i],
+                "month": run_in.month,
+                "year": run_in.year,
+                **{name: values[i] for name, values in columns.items()},
+                "status": "pending",
+                "notes": notes,
+            }
+            for i in chunk
+        ])
+        await create_notifications(db, [
+            salary_slip_notification(paid_ids[i], run_in.month, run_in.year) for i in chunk
+        ])
+
+    if paid_ids:
+        names, bucket = np.unique(np.array(departments), return_inverse=True)
+        counts = np.bincount(bucket)
+        totals = np.bincount(bucket, weights=pay["net_salary"])
+        deltas = PayrollAggregateDeltas()
+        for department, count, total in zip(names.tolist(), counts.tolist(), totals.tolist()):
+            deltas.add_totals(run_in.year, run_in.month, department, "pending", count, total)
+        await apply_payroll_aggregate_deltas(db, deltas)
+
+    return run, paid_ids
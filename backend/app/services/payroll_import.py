@@ -0,0 +1,163 @@
+import csv
+import io
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterator
+import openpyxl
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.schemas.salary_slip import SalarySlipCreate
+from app.services.salary_slip_service import bulk_insert_salary_slips
+
+IMPORT_FORMATS = {".csv", ".xlsx"}
+IMPORT_CHUNK_SIZE = 1000
+ERROR_REPORT_FIELDS = ["row", "employee_id", "error"]
+
+
+def _iter_csv_rows(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_xlsx_rows(fileobj: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if any(value is not None for value in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(fileobj: IO[bytes], extension: str) -> Iterator[tuple[int, dict]]:
+    """Yield (spreadsheet row number, raw row) pairs; row 1 is the header."""
+    if extension == ".csv":
+        return _iter_csv_rows(fileobj)
+    return _iter_xlsx_rows(fileobj)
+
+
+def _read_chunk(rows: Iterator[tuple[int, dict]]) -> list[tuple[int, dict]]:
+    return list(islice(rows, IMPORT_CHUNK_SIZE))
+
+
+def _clean_row(row: dict) -> dict:
+    # Blank cells mean "use the default", not an empty value.
+    return {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key and value is not None and not (isinstance(value, str) and not value.strip())
+    }
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class _ErrorReport:
+    """Lazily created CSV of rejected rows, written as the import runs."""
+
+    def __init__(self, import_id: str):
+        self.path = Path(settings.IMPORT_REPORT_DIR) / f"{import_id}.csv"
+        self._file = None
+        self._writer = None
+        self.count = 0
+
+    def _write(self, rows: list[dict]):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=ERROR_REPORT_FIELDS)
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+
+    async def add(self, rows: list[dict]):
+        if rows:
+            self.count += len(rows)
+            await run_in_threadpool(self._write, rows)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def error_report_path(import_id: str) -> Path | None:
+    """Return the error report for an import id, or None if it does not exist."""
+    try:
+        import_id = uuid.UUID(import_id).hex
+    except ValueError:
+        return None
+    path = Path(settings.IMPORT_REPORT_DIR) / f"{import_id}.csv"
+    return path if path.is_file() else None
+
+
+async def import_salary_slips(db: AsyncSession, fileobj: IO[bytes], extension: str) -> dict:
+    """
+    Import salary slips from a CSV or XLSX upload in bounded memory.
+
+    The file is parsed incrementally in a worker thread, IMPORT_CHUNK_SIZE rows
+    at a time; each chunk is validated and inserted through the set-based bulk
+    path and committed on its own, so memory does not grow with file size.
+    Rejected rows are written to a downloadable CSV error report.
+    """
+    import_id = uuid.uuid4().hex
+    report = _ErrorReport(import_id)
+    rows = await run_in_threadpool(iter_import_rows, fileobj, extension)
+    processed = imported = 0
+    employee_ids: set[int] = set()
+
+    try:
+        while chunk := await run_in_threadpool(_read_chunk, rows):
+            processed += len(chunk)
+            valid_slips: list[SalarySlipCreate] = []
+            valid_lines: list[int] = []
+            errors: list[dict] = []
+            for line, raw in chunk:
+                cleaned = _clean_row(raw)
+                try:
+                    valid_slips.append(SalarySlipCreate.model_validate(cleaned))
+                    valid_lines.append(line)
+                except ValidationError as exc:
+                    errors.append({
+                        "row": line,
+                        "employee_id": cleaned.get("employee_id"),
+                        "error": _validation_message(exc),
+                    })
+
+            if valid_slips:
+                _, insert_errors = await bulk_insert_salary_slips(db, valid_slips, returning=False)
+                await db.commit()
+                rejected = {error["index"] for error in insert_errors}
+                imported += len(valid_slips) - len(rejected)
+                employee_ids.update(
+                    slip.employee_id for index, slip in enumerate(valid_slips) if index not in rejected
+                )
+                errors.extend(
+                    {"row": valid_lines[error["index"]], "employee_id": error["employee_id"], "error": error["detail"]}
+                    for error in insert_errors
+                )
+
+            await report.add(sorted(errors, key=lambda error: error["row"]))
+    finally:
+        report.close()
+
+    if imported:
+        await response_cache.invalidate("salary_slips", *(f"user:{employee_id}" for employee_id in employee_ids))
+
+    return {
+        "import_id": import_id,
+        "processed": processed,
+        "imported": imported,
+        "failed": report.count,
+        "error_report_url": (
+            f"/admin/salary-slips/import/{import_id}/errors.csv" if report.count else None
+        ),
+    }
@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+import io
+from typing import AsyncIterator, Sequence
+import anyio
+import anyio.from_thread
+import openpyxl
+from anyio.abc import ObjectSendStream
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+
+REGISTER_FETCH_SIZE = 1000
+
+# Saved workbook bytes are handed to the response in chunks of about this size.
+REGISTER_CHUNK_SIZE = 64 * 1024
+
+REGISTER_HEADER = [
+    "Employee ID", "Name", "Email", "Department", "Position", "Year", "Month",
+    "Basic Salary", "Allowances", "Deductions", "Tax", "Net Salary", "Status", "Payment Date",
+]
+
+# Zero-based positions of the amount columns that are totalled in the last row.
+AMOUNT_COLUMNS = range(7, 12)
+
+
+def _append_rows(worksheet, rows: Sequence, totals: list[float]):
+    for row in rows:
+        worksheet.append(list(row))
+        for position in AMOUNT_COLUMNS:
+            totals[position - AMOUNT_COLUMNS.start] += row[position] or 0.0
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Unseekable write target for a workbook saved in a worker thread.
+
+    Bytes are buffered into REGISTER_CHUNK_SIZE chunks and sent to the event
+    loop; the ZIP writer's final flush sends the remainder. Once closed, writes
+    from an abandoned save (e.g. the ZIP writer's finalizer) are dropped.
+    """
+
+    def __init__(self, send: ObjectSendStream):
+        self._send = send
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if not self.closed:
+            self._buffer += data
+            if len(self._buffer) >= REGISTER_CHUNK_SIZE:
+                self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._buffer and not self.closed:
+            chunk, self._buffer = bytes(self._buffer), bytearray()
+            anyio.from_thread.run(self._send.send, chunk)
+
+    def close(self):
+        """End the stream; called on the event loop once the save is over."""
+        self._buffer.clear()
+        super().close()
+        self._send.close()
+
+
+async def stream_payroll_register(
+    year: int, month: int | None = None, department: str | None = None
+) -> AsyncIterator[bytes]:
+    """
+    Yield the payroll register for a period as an XLSX workbook.
+
+    Rows are streamed from a server-side cursor (``yield_per``) straight into an
+    openpyxl write-only worksheet, which spools to disk, so memory stays flat
+    for any number of slips. Worksheet writes run in the threadpool, one
+    fetched partition at a time, to keep the event loop free. The workbook is
+    then saved into the response as it is zipped, chunk by chunk, with no
+    intermediate file; a client that goes away stops the save.
+    """
+    filters = [SalarySlip.year == year]
+    if month:
+        filters.append(SalarySlip.month == month)
+    if department:
+        filters.append(User.department == department)
+
+    query = (
+        select(
+            User.id, User.full_name, User.email, User.department, User.position,
+            SalarySlip.year, SalarySlip.month, SalarySlip.basic_salary, SalarySlip.allowances,
+            SalarySlip.deductions, SalarySlip.tax, SalarySlip.net_salary, SalarySlip.status,
+            SalarySlip.payment_date,
+        )
+        .join(User, User.id == SalarySlip.employee_id)
+        .where(*filters)
+        .order_by(SalarySlip.year, SalarySlip.month, User.department, User.full_name, SalarySlip.id)
+        .execution_options(yield_per=REGISTER_FETCH_SIZE)
+    )
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Payroll Register")
+    worksheet.append(REGISTER_HEADER)
+    totals = [0.0] * len(AMOUNT_COLUMNS)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            await run_in_threadpool(_append_rows, worksheet, partition, totals)
+
+    worksheet.append(["Total", None, None, None, None, None, None, *totals, None, None])
+
+    # A small buffer keeps the saving thread at most a few chunks ahead of the client.
+    send, receive = anyio.create_memory_object_stream(max_buffer_size=4)
+    sink = _ChunkSink(send)
+    save = asyncio.ensure_future(run_in_threadpool(workbook.save, sink))
+    save.add_done_callback(lambda _: sink.close())
+    try:
+        async with receive:
+            async for chunk in receive:
+                yield chunk
+    except BaseException:
+        # The client went away: with the receiving end closed the saving
+        # thread's next write fails, so wait for it to wind down.
+        with contextlib.suppress(Exception):
+            await save
+        raise
+    await save
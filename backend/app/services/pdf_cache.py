@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+from app.services.pdf_renderer import render_salary_slip_pdf
+from app.services.pdf_service import PDF_TEMPLATE_VERSION
+
+
+class PdfCache:
+    """
+    Size-bounded LRU cache of rendered salary slip PDFs on disk.
+
+    Entries are named ``{slip_id}-{digest}.pdf`` where the digest covers the
+    slip id, both ``updated_at`` stamps and the template version, so any edit
+    to the slip or employee produces a new key instead of a stale hit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(salary_slip: SalarySlip, employee: User) -> str:
+        source = "|".join([
+            str(salary_slip.id),
+            salary_slip.updated_at.isoformat() if salary_slip.updated_at else "",
+            employee.updated_at.isoformat() if employee.updated_at else "",
+            PDF_TEMPLATE_VERSION,
+        ])
+        digest = hashlib.sha256(source.encode()).hexdigest()[:32]
+        return f"{salary_slip.id}-{digest}.pdf"
+
+    def _load_index(self):
+        # Rebuild the LRU order from file mtimes the first time the cache is touched.
+        if self._entries is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".pdf")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        self._entries = OrderedDict((entry.name, entry.stat().st_size) for entry in files)
+        self._total_bytes = sum(self._entries.values())
+
+    def get(self, key: str) -> bytes | None:
+        # Files are read and written outside the lock so lookups don't queue
+        # behind each other's disk I/O; only the index bookkeeping is serialized.
+        with self._lock:
+            self._load_index()
+        path = self.directory / key
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            if key not in self._entries:
+                # Written by another worker since the index was loaded.
+                self._total_bytes += len(data)
+            self._entries[key] = len(data)
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._load_index()
+        path = self.directory / key
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def invalidate(self, slip_id: int):
+        """Drop every cached rendition of a slip."""
+        with self._lock:
+            self._load_index()
+            for path in self.directory.glob(f"{slip_id}-*.pdf"):
+                path.unlink(missing_ok=True)
+                self._forget(path.name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            (self.directory / key).unlink(missing_ok=True)
+            self.evictions += 1
+
+
+pdf_cache = PdfCache(settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_BYTES)
+
+
+async def get_salary_slip_pdf(salary_slip: SalarySlip, employee: User, wait: bool = False) -> bytes:
+    """Return the slip PDF from the cache, rendering and storing it on a miss."""
+    key = PdfCache.key(salary_slip, employee)
+    pdf_bytes = await run_in_threadpool(pdf_cache.get, key)
+    if pdf_bytes is None:
+        pdf_bytes = await render_salary_slip_pdf(salary_slip, employee, wait=wait)
+        await run_in_threadpool(pdf_cache.put, key, pdf_bytes)
+    return pdf_bytes
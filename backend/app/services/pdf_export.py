@@ -0,0 +1,102 @@
+import asyncio
+import io
+import zipfile
+from typing import AsyncIterator
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+from app.services.pdf_cache import get_salary_slip_pdf
+
+EXPORT_PAGE_SIZE = 200
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands finished ZIP bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def export_filters(month: int, year: int, department: str | None) -> list:
+    filters = [SalarySlip.month == month, SalarySlip.year == year]
+    if department:
+        filters.append(User.department == department)
+    return filters
+
+
+async def _iter_period_slips(filters: list) -> AsyncIterator[tuple[SalarySlip, User]]:
+    # Page by primary key with a short-lived session per page, so the export
+    # never holds a read transaction open while PDFs are being rendered.
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(SalarySlip, User)
+                .join(User, User.id == SalarySlip.employee_id)
+                .where(*filters, SalarySlip.id > last_id)
+                .order_by(SalarySlip.id)
+                .limit(EXPORT_PAGE_SIZE)
+            )).all()
+        if not rows:
+            return
+        for slip, employee in rows:
+            yield slip, employee
+        last_id = rows[-1][0].id
+
+
+async def _render_entry(salary_slip: SalarySlip, employee: User) -> tuple[str, bytes]:
+    # Slip id keeps names unique when an employee has several slips for a period.
+    name = f"salary_slip_{salary_slip.month}_{salary_slip.year}_emp_{employee.id}_{salary_slip.id}.pdf"
+    return name, await get_salary_slip_pdf(salary_slip, employee, wait=True)
+
+
+async def stream_salary_slips_zip(month: int, year: int, department: str | None = None) -> AsyncIterator[bytes]:
+    """
+    Yield a ZIP archive of every slip in a payroll period as it is produced.
+
+    Slips are rendered concurrently through the PDF worker pool with a fixed
+    window of in-flight renders, and each PDF is written to the archive (and
+    released) as soon as it finishes, so memory stays flat regardless of
+    headcount.
+    """
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    window = settings.PDF_RENDER_WORKERS * 2
+    pending: set[asyncio.Task] = set()
+
+    async def write_finished(return_when: str) -> bytes:
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        for task in done:
+            name, pdf_bytes = task.result()
+            archive.writestr(name, pdf_bytes)
+        return sink.drain()
+
+    try:
+        async for slip, employee in _iter_period_slips(export_filters(month, year, department)):
+            pending.add(asyncio.create_task(_render_entry(slip, employee)))
+            if len(pending) >= window:
+                chunk = await write_finished(asyncio.FIRST_COMPLETED)
+                if chunk:
+                    yield chunk
+        if pending:
+            yield await write_finished(asyncio.ALL_COMPLETED)
+        archive.close()
+        yield sink.drain()
+    finally:
+        for task in pending:
+            task.cancel()
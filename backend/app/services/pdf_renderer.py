@@ -0,0 +1,66 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+from app.services.pdf_service import (
+    employee_render_data,
+    generate_salary_slip_pdf_from_data,
+    salary_slip_render_data,
+)
+
+_executor: ProcessPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.PDF_RENDER_QUEUE_LIMIT)
+    return _slots
+
+
+async def render_salary_slip_pdf(salary_slip: SalarySlip, employee: User, wait: bool = False) -> bytes:
+    """
+    Render a salary slip PDF in the worker process pool.
+
+    At most PDF_RENDER_QUEUE_LIMIT renders may be queued or running at once.
+    Interactive callers get a 503 when the queue is full; batch callers pass
+    wait=True to block until a slot frees up instead.
+    """
+    slots = _get_slots()
+    if not wait and slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF renderer is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    slip_data = salary_slip_render_data(salary_slip)
+    employee_data = employee_render_data(employee)
+
+    async with slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(), generate_salary_slip_pdf_from_data, slip_data, employee_data
+        )
+
+
+def shutdown_pdf_renderer():
+    """Stop the worker pool; called on application shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
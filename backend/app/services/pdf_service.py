@@ -6,10 +6,14 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from reportlab.pdfgen import canvas
 from io import BytesIO
+from types import SimpleNamespace
 import qrcode
 from app.models.salary_slip import SalarySlip
 from app.models.user import User
 
+# Bump whenever the layout below changes so cached PDFs are re-rendered.
+PDF_TEMPLATE_VERSION = "1"
+
 
 def generate_salary_slip_pdf(salary_slip: SalarySlip, employee: User) -> bytes:
     """Generate a professional salary slip PDF."""
@@ -158,3 +162,35 @@ def generate_salary_slip_pdf(salary_slip: SalarySlip, employee: User) -> bytes:
     buffer.seek(0)
     return buffer.getvalue()
 
+
+
+def salary_slip_render_data(salary_slip: SalarySlip) -> dict:
+    """Extract the plain slip fields the PDF template reads."""
+    return {
+        "id": salary_slip.id,
+        "month": salary_slip.month,
+        "year": salary_slip.year,
+        "basic_salary": salary_slip.basic_salary,
+        "allowances": salary_slip.allowances,
+        "deductions": salary_slip.deductions,
+        "tax": salary_slip.tax,
+        "net_salary": salary_slip.net_salary,
+        "payment_date": salary_slip.payment_date,
+        "notes": salary_slip.notes,
+    }
+
+
+def employee_render_data(employee: User) -> dict:
+    """Extract the plain employee fields the PDF template reads."""
+    return {
+        "id": employee.id,
+        "full_name": employee.full_name,
+        "email": employee.email,
+        "department": employee.department,
+        "position": employee.position,
+    }
+
+
+def generate_salary_slip_pdf_from_data(slip_data: dict, employee_data: dict) -> bytes:
+    """Render a salary slip from plain dicts (picklable entry point for worker processes)."""
+    return generate_salary_slip_pdf(SimpleNamespace(**slip_data), SimpleNamespace(**employee_data))
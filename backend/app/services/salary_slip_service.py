@@ -0,0 +1,163 @@
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.notification import NotificationType
+from app.models.salary_slip import SalarySlip
+from app.models.user import User
+from app.schemas.salary_slip import SalarySlipCreate
+from app.services.notification_service import create_notifications
+from app.services.payroll_aggregate_service import PayrollAggregateDeltas, apply_payroll_aggregate_deltas
+from app.services.tax_engine import TaxTableNotFound, monthly_tax, monthly_tax_batch
+
+
+def taxable_pay(basic_salary, allowances, deductions):
+    """Pay subject to income tax; element-wise when given NumPy arrays."""
+    return basic_salary + allowances - deductions
+
+
+def net_salary(basic_salary, allowances, deductions, tax):
+    """Net pay; element-wise when given NumPy arrays."""
+    return taxable_pay(basic_salary, allowances, deductions) - tax
+
+
+def fill_missing_tax(rows: list[dict]) -> dict[int, str]:
+    """
+    Compute ``tax`` for slip rows that leave it None, one vectorized batch per tax year.
+
+    Rows whose year has no tax table keep ``tax`` None; their positions in
+    ``rows`` are returned mapped to the reason.
+    """
+    untaxed = [i for i, row in enumerate(rows) if row["tax"] is None]
+    failed = {}
+    for year in {rows[i]["year"] for i in untaxed}:
+        batch = [i for i in untaxed if rows[i]["year"] == year]
+        taxable = np.fromiter(
+            (taxable_pay(rows[i]["basic_salary"], rows[i]["allowances"], rows[i]["deductions"]) for i in batch),
+            dtype=np.float64,
+            count=len(batch),
+        )
+        try:
+            taxes = monthly_tax_batch(taxable, year).tolist()
+        except TaxTableNotFound as exc:
+            failed.update((i, str(exc)) for i in batch)
+            continue
+        for i, tax in zip(batch, taxes):
+            rows[i]["tax"] = tax
+    return failed
+
+
+def refresh_derived_tax(slip: SalarySlip, update_data: dict):
+    """
+    Recompute a slip's bracket-derived tax when ``update_data`` changes its pay or year.
+
+    Slips do not record where their tax came from, so it counts as derived
+    while it still equals the brackets' figure for the slip as stored; tax
+    entered by hand or from a flat payroll-run rate is kept, and a ``tax`` in
+    the edit always wins. Raises TaxTableNotFound for a year without a table.
+    """
+    if "tax" in update_data or not any(
+        key in update_data for key in ("basic_salary", "allowances", "deductions", "year")
+    ):
+        return
+    try:
+        derived = slip.tax == monthly_tax(taxable_pay(slip.basic_salary, slip.allowances, slip.deductions), slip.year)
+    except TaxTableNotFound:
+        return
+    if derived:
+        update_data["tax"] = monthly_tax(
+            taxable_pay(
+                update_data.get("basic_salary", slip.basic_salary),
+                update_data.get("allowances", slip.allowances),
+                update_data.get("deductions", slip.deductions),
+            ),
+            update_data.get("year", slip.year),
+        )
+
+
+def salary_slip_notification(employee_id: int, month: int, year: int) -> dict:
+    """Outbox row telling an employee a slip was generated for them."""
+    return {
+        "user_id": employee_id,
+        "type": NotificationType.SALARY_SLIP,
+        "title": "New Salary Slip Generated",
+        "message": f"Your salary slip for {month}/{year} has been generated.",
+    }
+
+
+async def bulk_insert_salary_slips(
+    db: AsyncSession,
+    salary_slips: list[SalarySlipCreate],
+    returning: bool = True,
+) -> tuple[list[SalarySlip], list[dict]]:
+    """
+    Insert a batch of salary slips in a fixed number of round trips.
+
+    Returns the created slips (none when ``returning`` is False) and the
+    rejected rows as ``{"index", "employee_id", "detail"}``: unknown
+    employees, and omitted tax for a year without a tax table. Nothing is
+    committed.
+    """
+    employee_ids = {slip.employee_id for slip in salary_slips}
+    employees = {
+        employee.id: employee
+        for employee in (await db.scalars(select(User).where(User.id.in_(employee_ids)))).all()
+    } if employee_ids else {}
+
+    rows = []
+    indexes = []
+    errors = []
+    for index, slip in enumerate(salary_slips):
+        if slip.employee_id not in employees:
+            errors.append({
+                "index": index,
+                "employee_id": slip.employee_id,
+                "detail": "Employee not found",
+            })
+            continue
+        rows.append({**slip.model_dump(), "status": "pending"})
+        indexes.append(index)
+
+    untaxable = fill_missing_tax(rows)
+    if untaxable:
+        errors.extend(
+            {"index": indexes[i], "employee_id": rows[i]["employee_id"], "detail": detail}
+            for i, detail in untaxable.items()
+        )
+        errors.sort(key=lambda error: error["index"])
+        rows = [row for i, row in enumerate(rows) if i not in untaxable]
+
+    if not rows:
+        return [], errors
+
+    for row in rows:
+        row["net_salary"] = net_salary(row["basic_salary"], row["allowances"], row["deductions"], row["tax"])
+
+    if returning:
+        # RETURNING order is not guaranteed across multi-row batches; ids are
+        # assigned in insert order, so sort by them instead of asking SQLAlchemy
+        # for parameter ordering (which degrades to one INSERT per row on SQLite).
+        created = sorted(
+            (await db.scalars(insert(SalarySlip).returning(SalarySlip), rows)).all(),
+            key=lambda slip: slip.id,
+        )
+        # Attach the employees fetched above so responses need no per-row lazy load.
+        for slip in created:
+            set_committed_value(slip, "employee", employees[slip.employee_id])
+    else:
+        await db.execute(insert(SalarySlip), rows)
+        created = []
+
+    await create_notifications(db, [
+        salary_slip_notification(row["employee_id"], row["month"], row["year"]) for row in rows
+    ])
+
+    deltas = PayrollAggregateDeltas()
+    for row in rows:
+        deltas.add(
+            row["year"], row["month"], employees[row["employee_id"]].department,
+            row["status"], row["net_salary"]
+        )
+    await apply_payroll_aggregate_deltas(db, deltas)
+
+    return created, errors
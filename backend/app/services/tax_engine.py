@@ -0,0 +1,121 @@
+from bisect import bisect_right
+from functools import lru_cache
+import numpy as np
+from app.core.config import settings
+
+# Salary slips are monthly: tax is worked out on the annualized amount.
+PAY_PERIODS_PER_YEAR = 12
+
+# Annual progressive brackets as (lower threshold, marginal rate), per
+# jurisdiction and tax year. Bump the version whenever a published table is
+# corrected so memoized results for the old figures are not reused.
+TAX_BRACKETS: dict[tuple[str, int], tuple[str, list[tuple[float, float]]]] = {
+    # US federal income tax, single filer.
+    ("US-FED-SINGLE", 2024): ("2024.1", [
+        (0, 0.10), (11600, 0.12), (47150, 0.22), (100525, 0.24),
+        (191950, 0.32), (243725, 0.35), (609350, 0.37),
+    ]),
+    ("US-FED-SINGLE", 2025): ("2025.1", [
+        (0, 0.10), (11925, 0.12), (48475, 0.22), (103350, 0.24),
+        (197300, 0.32), (250525, 0.35), (626350, 0.37),
+    ]),
+    ("US-FED-SINGLE", 2026): ("2026.1", [
+        (0, 0.10), (12400, 0.12), (50400, 0.22), (105700, 0.24),
+        (201775, 0.32), (256225, 0.35), (640600, 0.37),
+    ]),
+}
+
+
+class TaxTableNotFound(LookupError):
+    """No bracket table covers the requested jurisdiction and year."""
+
+    def __init__(self, jurisdiction: str, year: int):
+        super().__init__(f"No tax table for {jurisdiction} in {year}")
+        self.jurisdiction = jurisdiction
+        self.year = year
+
+
+class TaxTable:
+    """
+    A bracket table compiled into sorted threshold arrays.
+
+    ``base_tax[i]`` is the tax owed at ``thresholds[i]``, so the tax on any
+    amount is one bracket lookup plus one multiply-add.
+    """
+
+    def __init__(self, jurisdiction: str, year: int, version: str, brackets: list[tuple[float, float]]):
+        brackets = sorted(brackets)
+        if not brackets or brackets[0][0] != 0:
+            raise ValueError(f"Tax table {jurisdiction}/{year} must start at 0")
+        self.jurisdiction = jurisdiction
+        self.year = year
+        self.version = version
+        self.key = f"{jurisdiction}/{year}/{version}"
+        self.thresholds = [float(lower) for lower, _ in brackets]
+        self.rates = [float(rate) for _, rate in brackets]
+        self.base_tax = [0.0]
+        for i in range(1, len(brackets)):
+            width = self.thresholds[i] - self.thresholds[i - 1]
+            self.base_tax.append(self.base_tax[-1] + width * self.rates[i - 1])
+        self._thresholds = np.array(self.thresholds)
+        self._rates = np.array(self.rates)
+        self._base_tax = np.array(self.base_tax)
+
+    def tax(self, amount: float) -> float:
+        """Annual tax on one taxable amount (memoized per table version and amount)."""
+        return _memoized_tax(self.key, float(amount))
+
+    def _tax(self, amount: float) -> float:
+        if amount <= 0:
+            return 0.0
+        i = bisect_right(self.thresholds, amount) - 1
+        return self.base_tax[i] + (amount - self.thresholds[i]) * self.rates[i]
+
+    def tax_batch(self, amounts: np.ndarray) -> np.ndarray:
+        """Annual tax on a whole array of taxable amounts at once."""
+        amounts = np.maximum(np.asarray(amounts, dtype=np.float64), 0.0)
+        i = np.searchsorted(self._thresholds, amounts, side="right") - 1
+        return self._base_tax[i] + (amounts - self._thresholds[i]) * self._rates[i]
+
+
+TAX_TABLES: dict[str, dict[int, TaxTable]] = {}
+_TABLES_BY_KEY: dict[str, TaxTable] = {}
+for (_jurisdiction, _year), (_version, _brackets) in TAX_BRACKETS.items():
+    _table = TaxTable(_jurisdiction, _year, _version, _brackets)
+    TAX_TABLES.setdefault(_jurisdiction, {})[_year] = _table
+    _TABLES_BY_KEY[_table.key] = _table
+
+
+@lru_cache(maxsize=65536)
+def _memoized_tax(table_key: str, amount: float) -> float:
+    return _TABLES_BY_KEY[table_key]._tax(amount)
+
+
+def get_tax_table(year: int, jurisdiction: str | None = None) -> TaxTable:
+    """
+    Bracket table for a tax year, defaulting to TAX_JURISDICTION.
+
+    A year without its own table uses the latest earlier one, so payroll
+    keeps working until the new year's brackets are added. Years before the
+    earliest table, and unknown jurisdictions, raise ``TaxTableNotFound``
+    rather than being taxed with brackets that never applied to them.
+    """
+    jurisdiction = jurisdiction or settings.TAX_JURISDICTION
+    tables = TAX_TABLES.get(jurisdiction, {})
+    years = [table_year for table_year in tables if table_year <= year]
+    if not years:
+        raise TaxTableNotFound(jurisdiction, year)
+    return tables[max(years)]
+
+
+def monthly_tax(taxable: float, year: int, jurisdiction: str | None = None) -> float:
+    """Tax for one month's taxable pay, worked out on its annualized amount."""
+    table = get_tax_table(year, jurisdiction)
+    return round(table.tax(taxable * PAY_PERIODS_PER_YEAR) / PAY_PERIODS_PER_YEAR, 2)
+
+
+def monthly_tax_batch(taxable: np.ndarray, year: int, jurisdiction: str | None = None) -> np.ndarray:
+    """``monthly_tax`` for a whole array of monthly taxable amounts."""
+    table = get_tax_table(year, jurisdiction)
+    annual = np.asarray(taxable, dtype=np.float64) * PAY_PERIODS_PER_YEAR
+    return np.round(table.tax_batch(annual) / PAY_PERIODS_PER_YEAR, 2)
@@ -0,0 +1,37 @@
+from typing import Optional
+from fastapi import Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.serialization import response_columns
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+
+def include_query(*names: str) -> Optional[str]:
+    """``include`` query parameter accepting a comma-separated subset of ``names``."""
+    choice = "|".join(names)
+    return Query(
+        None,
+        pattern=f"^({choice})(,({choice}))*$",
+        description=f"Related objects to embed in each item: {', '.join(names)}",
+    )
+
+
+async def embed_employees(db: AsyncSession, items: list[dict], include: str | None) -> list[dict]:
+    """
+    Set each row's ``employee`` to its UserResponse fields, or to None.
+
+    Employees are only fetched when ``include`` names them, with one
+    SELECT ... IN for the whole page, so a page costs a fixed number of
+    queries however many rows it has.
+    """
+    employees = {}
+    if include and "employee" in include.split(",") and items:
+        employee_ids = {item["employee_id"] for item in items}
+        result = await db.execute(
+            select(*response_columns(UserResponse, User)).where(User.id.in_(employee_ids))
+        )
+        employees = {row.id: dict(row._mapping) for row in result}
+    for item in items:
+        item["employee"] = employees.get(item["employee_id"])
+    return items
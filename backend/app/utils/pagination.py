@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Sequence
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, column) -> Any:
+    python_type = column.type.python_type
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row of a page as an opaque token."""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [_decode_value(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_paginate(
+    query: Select,
+    sort_columns: Sequence,
+    cursor: str | None,
+    skip: int,
+    limit: int,
+    descending: bool = True,
+) -> Select:
+    """
+    Order a query by a unique sort key and fetch one page of it.
+
+    With a cursor the page starts strictly after the encoded key, which is an
+    index range scan whatever the depth; ``skip`` is only used (as a plain
+    OFFSET) when no cursor is given, for backwards compatibility.
+    """
+    order_by = [column.desc() if descending else column.asc() for column in sort_columns]
+    query = query.order_by(*order_by).limit(limit)
+
+    if cursor:
+        key = tuple_(*sort_columns)
+        values = tuple_(*decode_cursor(cursor, sort_columns))
+        return query.where(key < values if descending else key > values)
+    return query.offset(skip)
+
+
+def set_next_cursor(response: Response, rows: Sequence, sort_columns: Sequence, limit: int):
+    """Expose the cursor for the page after ``rows`` through the X-Next-Cursor header."""
+    if len(rows) < limit:
+        return
+    last_row = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+        [getattr(last_row, column.key) for column in sort_columns]
+    )
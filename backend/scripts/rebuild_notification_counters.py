@@ -0,0 +1,33 @@
+"""
+Rebuild the notification_counters table from notifications.
+Run this after inserting notifications outside the outbox or if unread badges drift.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.notification_service import rebuild_notification_counters
+
+
+async def rebuild() -> int:
+    """Rebuild all unread counters in a single transaction."""
+    async with AsyncSessionLocal() as db:
+        counters = await rebuild_notification_counters(db)
+        await db.commit()
+    await async_engine.dispose()
+    return counters
+
+
+def main():
+    """Main rebuild function."""
+    print("Rebuilding notification counters...")
+    counters = asyncio.run(rebuild())
+    print(f"Rebuilt {counters} unread counters")
+
+
+if __name__ == "__main__":
+    main()
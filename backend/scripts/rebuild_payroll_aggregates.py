@@ -0,0 +1,33 @@
+"""
+Rebuild the payroll_monthly_aggregates table from salary_slips.
+Run this after importing slips outside the API or if the totals drift.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.payroll_aggregate_service import rebuild_payroll_aggregates
+
+
+async def rebuild() -> int:
+    """Rebuild all aggregate rows in a single transaction."""
+    async with AsyncSessionLocal() as db:
+        buckets = await rebuild_payroll_aggregates(db)
+        await db.commit()
+    await async_engine.dispose()
+    return buckets
+
+
+def main():
+    """Main rebuild function."""
+    print("Rebuilding payroll aggregates...")
+    buckets = asyncio.run(rebuild())
+    print(f"Rebuilt {buckets} aggregate rows")
+
+
+if __name__ == "__main__":
+    main()
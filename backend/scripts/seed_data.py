@@ -8,18 +8,23 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from alembic import command
+from alembic.config import Config
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.salary_slip import SalarySlip
 from app.models.expense import Expense, ExpenseStatus, ExpenseCategory
 from app.models.notification import Notification, NotificationType
+from scripts.rebuild_notification_counters import rebuild as rebuild_notification_counters
+from scripts.rebuild_payroll_aggregates import rebuild as rebuild_payroll_aggregates
 from datetime import datetime, date, timedelta
+import asyncio
 import random
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+command.upgrade(Config(str(Path(__file__).parent.parent / "alembic.ini")), "head")
 
 db: Session = SessionLocal()
 
@@ -251,6 +256,13 @@ def main():
         seed_expenses(users)
         seed_notifications(users)
         
+        print("Rebuilding payroll aggregates...")
+        asyncio.run(rebuild_payroll_aggregates())
+        
+        # Notifications were inserted directly, bypassing the counters
+        print("Rebuilding notification counters...")
+        asyncio.run(rebuild_notification_counters())
+        
         print("=" * 50)
         print("Database seeding completed successfully!")
         print("\nDemo accounts:")
@@ -0,0 +1,89 @@
+import itertools
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+# Point the app at a throwaway database before anything imports the settings.
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.core.security import get_password_hash
+from app.main import app
+from app.models.user import User, UserRole
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Migrate the test database and add one admin and one employee."""
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+    db = SessionLocal()
+    db.add_all([
+        User(email="admin@test.org", hashed_password=get_password_hash("pw"), full_name="Admin", role=UserRole.ADMIN),
+        User(email="employee@test.org", hashed_password=get_password_hash("pw"), full_name="Employee", role=UserRole.EMPLOYEE),
+    ])
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def employee_id() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(User.id).filter(User.email == "employee@test.org").scalar()
+    finally:
+        db.close()
+
+
+@pytest_asyncio.fixture
+async def db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def login(client: TestClient, email: str, password: str = "pw") -> dict:
+    """Authorization headers for a user."""
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def admin_headers(client) -> dict:
+    return login(client, "admin@test.org")
+
+
+@pytest.fixture
+def make_employee():
+    """Create a fresh employee; returns their id and email."""
+    def make(department: str | None = None) -> tuple[int, str]:
+        email = f"employee{next(_emails)}@test.org"
+        db = SessionLocal()
+        try:
+            employee = User(
+                email=email, hashed_password=get_password_hash("pw"), full_name=f"Employee {email}",
+                role=UserRole.EMPLOYEE, department=department,
+            )
+            db.add(employee)
+            db.commit()
+            return employee.id, email
+        finally:
+            db.close()
+    return make
@@ -0,0 +1,81 @@
+import hashlib
+import os
+
+import pytest
+
+
+@pytest.fixture
+def uploaded(client) -> tuple[str, bytes]:
+    """URL and content of a freshly uploaded file."""
+    content = os.urandom(1000)
+    response = client.post("/upload", files={"file": ("statement.pdf", content, "application/pdf")})
+    assert response.status_code == 200, response.text
+    return response.json()["url"], content
+
+
+def test_full_download_carries_a_content_etag(client, uploaded):
+    url, content = uploaded
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["ETag"] == f'"{hashlib.sha256(content).hexdigest()}"'
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert "immutable" in response.headers["Cache-Control"]
+
+
+def test_matching_if_none_match_is_not_modified(client, uploaded):
+    url, _ = uploaded
+    etag = client.get(url).headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=900-", 900, 999),
+    ("bytes=-10", 990, 999),
+    ("bytes=950-5000", 950, 999),
+])
+def test_single_range_is_partial_content(client, uploaded, range_header, start, end):
+    url, content = uploaded
+    response = client.get(url, headers={"Range": range_header})
+
+    assert response.status_code == 206
+    assert response.content == content[start:end + 1]
+    assert response.headers["Content-Range"] == f"bytes {start}-{end}/1000"
+    assert response.headers["Content-Length"] == str(end - start + 1)
+
+
+def test_unsatisfiable_range_is_rejected(client, uploaded):
+    url, _ = uploaded
+    response = client.get(url, headers={"Range": "bytes=1000-"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == "bytes */1000"
+
+
+def test_malformed_or_multiple_ranges_serve_the_whole_file(client, uploaded):
+    url, content = uploaded
+    for range_header in ("bytes=0-9,20-29", "items=0-9", "bytes=50-10"):
+        response = client.get(url, headers={"Range": range_header})
+        assert response.status_code == 200
+        assert response.content == content
+
+
+def test_if_range_only_honours_the_current_etag(client, uploaded):
+    url, content = uploaded
+    etag = client.get(url).headers["ETag"]
+
+    current = client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert current.status_code == 206
+    assert current.content == content[:10]
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == content
@@ -0,0 +1,81 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, func, insert, select
+from app.models.notification import Notification, NotificationCounter, NotificationType
+from app.services.notification_service import (
+    create_notifications,
+    dispatch_notification_outbox,
+    get_unread_count,
+    mark_notifications_read,
+    rebuild_notification_counters,
+)
+
+
+async def unread_rows(db, user_id: int) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+    )
+
+
+def announcement(user_id: int, n: int) -> dict:
+    return {"user_id": user_id, "type": NotificationType.ANNOUNCEMENT, "title": f"Notice {n}", "message": "Hello"}
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clean_notifications(db):
+    await db.execute(delete(Notification))
+    await db.execute(delete(NotificationCounter))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_counter_follows_delivery_and_reads(db, employee_id):
+    await create_notifications(db, [announcement(employee_id, n) for n in range(4)])
+    await db.commit()
+    assert await dispatch_notification_outbox(100) == 4
+    assert await get_unread_count(db, employee_id) == await unread_rows(db, employee_id) == 4
+
+    ids = (await db.scalars(select(Notification.id).where(Notification.user_id == employee_id))).all()
+    # Marking an already-read notification again must not lower the counter twice.
+    for batch in ([ids[0]], [ids[0], ids[1]]):
+        await mark_notifications_read(db, employee_id, batch)
+        await db.commit()
+    assert await get_unread_count(db, employee_id) == await unread_rows(db, employee_id) == 2
+
+    await mark_notifications_read(db, employee_id)
+    await db.commit()
+    assert await get_unread_count(db, employee_id) == await unread_rows(db, employee_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_counter_never_goes_negative_for_rows_inserted_directly(db, employee_id):
+    # Rows written around the outbox (e.g. by the seed script) have no counter yet.
+    await db.execute(insert(Notification.__table__), [
+        {**announcement(employee_id, n), "is_read": False} for n in range(3)
+    ])
+    await db.commit()
+    first = await db.scalar(select(func.min(Notification.id)).where(Notification.user_id == employee_id))
+    await db.execute(insert(NotificationCounter.__table__), [{"user_id": employee_id, "unread_count": 1}])
+    await db.commit()
+
+    assert await mark_notifications_read(db, employee_id, [first, first + 1]) == 2
+    await db.commit()
+    assert await get_unread_count(db, employee_id) == 0
+
+    await mark_notifications_read(db, employee_id)
+    await db.commit()
+    assert await get_unread_count(db, employee_id) == await unread_rows(db, employee_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_unread_rows(db, employee_id):
+    await db.execute(insert(Notification.__table__), [
+        {**announcement(employee_id, n), "is_read": n % 2 == 0} for n in range(5)
+    ])
+    await db.commit()
+    assert await get_unread_count(db, employee_id) == 0
+
+    assert await rebuild_notification_counters(db) == 1
+    await db.commit()
+    assert await get_unread_count(db, employee_id) == await unread_rows(db, employee_id) == 2
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app.models.notification import NotificationStreamTicket
+from app.services.notification_service import issue_stream_ticket, redeem_stream_ticket
+from tests.conftest import login
+
+
+@pytest.mark.asyncio
+async def test_ticket_is_redeemed_once(db, employee_id):
+    ticket = await issue_stream_ticket(db, employee_id)
+    await db.commit()
+    assert await redeem_stream_ticket(db, ticket) == employee_id
+    assert await redeem_stream_ticket(db, ticket) is None
+    assert await redeem_stream_ticket(db, "not-a-ticket") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_ticket_is_rejected(db, employee_id):
+    ticket = await issue_stream_ticket(db, employee_id)
+    await db.execute(update(NotificationStreamTicket).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    await db.commit()
+    assert await redeem_stream_ticket(db, ticket) is None
+
+
+def test_stream_does_not_accept_access_tokens(client, make_employee):
+    _, email = make_employee()
+    headers = login(client, email)
+    access_token = headers["Authorization"].removeprefix("Bearer ")
+
+    response = client.post("/employee/notifications/stream-ticket", headers=headers)
+    assert response.status_code == 201
+    assert response.json()["expires_in"] == 30
+    assert response.json()["ticket"] != access_token
+
+    assert client.get("/employee/notifications/stream", params={"token": access_token}).status_code == 422
+    assert client.get("/employee/notifications/stream", params={"ticket": access_token}).status_code == 401
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.models.notification import Notification, NotificationType
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from tests.conftest import login
+
+
+def test_cursor_round_trips_the_sort_key():
+    created_at = datetime(2025, 3, 1, 9, 30, 15, 250000)
+    cursor = encode_cursor([created_at, 42])
+
+    assert decode_cursor(cursor, [Notification.created_at, Notification.id]) == [created_at, 42]
+
+
+def test_notification_pages_follow_the_cursor_across_sort_key_ties(client, make_employee):
+    employee_id, email = make_employee()
+    # Five notifications share one created_at, so only the id breaks the tie.
+    created_at = datetime(2025, 3, 1, 9, 30)
+    db = SessionLocal()
+    try:
+        notifications = [
+            Notification(user_id=employee_id, type=NotificationType.GENERAL, title=f"n{i}", message="", created_at=created_at)
+            for i in range(5)
+        ]
+        db.add_all(notifications)
+        db.commit()
+        expected = sorted((notification.id for notification in notifications), reverse=True)
+    finally:
+        db.close()
+    headers = login(client, email)
+
+    seen, cursor = [], None
+    for _ in range(len(expected)):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/employee/notifications", headers=headers, params=params)
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert seen == expected
+    # The last page is short, so it carries no cursor.
+    assert len(response.json()) == 1
+
+
+def test_malformed_cursor_is_rejected(client, make_employee):
+    _, email = make_employee()
+    response = client.get("/employee/notifications", headers=login(client, email), params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,47 @@
+from sqlalchemy import select
+from app.core.database import SessionLocal
+from app.models.payroll_aggregate import PayrollMonthlyAggregate
+from tests.conftest import login
+
+
+def aggregates(*departments: str) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.scalars(
+            select(PayrollMonthlyAggregate).where(PayrollMonthlyAggregate.department.in_(departments))
+        ).all()
+        return {
+            (row.department, row.month, row.status): (row.slip_count, row.total_net_salary)
+            for row in rows
+            if row.slip_count or row.total_net_salary
+        }
+    finally:
+        db.close()
+
+
+def test_slip_edits_after_a_department_change_hit_the_right_buckets(client, admin_headers, make_employee):
+    employee_id, email = make_employee("Sales")
+    slips = []
+    for month in (1, 2):
+        response = client.post("/admin/salary-slip", headers=admin_headers, json={
+            "employee_id": employee_id, "month": month, "year": 2025,
+            "basic_salary": 1000, "allowances": 0, "deductions": 0, "tax": 100,
+        })
+        assert response.status_code == 201, response.text
+        slips.append(response.json()["id"])
+    assert aggregates("Sales", "Support") == {
+        ("Sales", 1, "pending"): (1, 900.0),
+        ("Sales", 2, "pending"): (1, 900.0),
+    }
+
+    response = client.put("/employee/profile", headers=login(client, email), json={"department": "Support"})
+    assert response.status_code == 200, response.text
+    assert aggregates("Sales", "Support") == {
+        ("Support", 1, "pending"): (1, 900.0),
+        ("Support", 2, "pending"): (1, 900.0),
+    }
+
+    response = client.put(f"/admin/salary-slip/{slips[0]}", headers=admin_headers, json={"basic_salary": 2000, "status": "paid"})
+    assert response.status_code == 200, response.text
+    assert client.delete(f"/admin/salary-slip/{slips[1]}", headers=admin_headers).status_code == 204
+    assert aggregates("Sales", "Support") == {("Support", 1, "paid"): (1, 1900.0)}
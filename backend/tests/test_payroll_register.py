@@ -0,0 +1,26 @@
+import io
+import openpyxl
+
+
+def test_register_streams_a_workbook_with_totals(client, admin_headers, make_employee):
+    employee_id, _ = make_employee("Register")
+    for month, basic_salary in ((3, 1000), (4, 1500)):
+        response = client.post("/admin/salary-slip", headers=admin_headers, json={
+            "employee_id": employee_id, "month": month, "year": 2024,
+            "basic_salary": basic_salary, "allowances": 0, "deductions": 0, "tax": 0,
+        })
+        assert response.status_code == 201, response.text
+
+    response = client.get(
+        "/admin/reports/payroll-register.xlsx",
+        params={"year": 2024, "department": "Register"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == "attachment; filename=payroll_register_2024.xlsx"
+    assert "content-length" not in response.headers
+
+    rows = list(openpyxl.load_workbook(io.BytesIO(response.content)).active.values)
+    assert rows[0][0] == "Employee ID"
+    assert [(row[0], row[6], row[11]) for row in rows[1:-1]] == [(employee_id, 3, 1000), (employee_id, 4, 1500)]
+    assert rows[-1][0] == "Total" and rows[-1][11] == 2500
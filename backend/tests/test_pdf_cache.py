@@ -0,0 +1,41 @@
+import threading
+from app.services.pdf_cache import PdfCache
+
+
+def test_hits_misses_and_eviction(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=10)
+    assert cache.get("1-a.pdf") is None
+
+    cache.put("1-a.pdf", b"aaaa")
+    cache.put("2-b.pdf", b"bbbb")
+    assert cache.get("1-a.pdf") == b"aaaa"
+    cache.put("3-c.pdf", b"cccc")  # over budget: 2-b is least recently used
+
+    assert cache.get("2-b.pdf") is None
+    assert cache.get("3-c.pdf") == b"cccc"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+    assert (stats["entries"], stats["bytes"]) == (2, 8)
+
+
+def test_files_written_by_another_worker_are_counted(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=100)
+    assert cache.stats()["entries"] == 0
+    (tmp_path / "4-d.pdf").write_bytes(b"dddd")
+
+    assert cache.get("4-d.pdf") == b"dddd"
+    assert cache.get("4-d.pdf") == b"dddd"
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (1, 4)
+
+
+def test_concurrent_hits(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=1 << 20)
+    cache.put("5-e.pdf", b"e" * 1000)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("5-e.pdf"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [b"e" * 1000] * 8
+    assert cache.stats()["bytes"] == 1000
@@ -0,0 +1,56 @@
+import pytest
+from app.core.cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path) -> ResponseCache:
+    if request.param == "sqlite":
+        return ResponseCache(SQLiteCacheBackend(str(tmp_path / "responses.sqlite3"), 100), 60)
+    return ResponseCache(MemoryCacheBackend(100, 60), 60)
+
+
+@pytest.mark.asyncio
+async def test_invalidating_a_tag_only_drops_dependent_responses(cache):
+    calls = {"slips": 0, "expenses": 0}
+
+    @cache.cached(tags=lambda kwargs: ["salary_slips", f"user:{kwargs['employee_id']}"])
+    async def list_slips(employee_id: int):
+        calls["slips"] += 1
+        return {"employee_id": employee_id, "calls": calls["slips"]}
+
+    @cache.cached(tags=["expenses"])
+    async def list_expenses():
+        calls["expenses"] += 1
+        return {"calls": calls["expenses"]}
+
+    assert (await list_slips(employee_id=1)).headers["X-Cache"] == "MISS"
+    assert (await list_slips(employee_id=2)).headers["X-Cache"] == "MISS"
+    assert (await list_expenses()).headers["X-Cache"] == "MISS"
+
+    await cache.invalidate("user:1")
+
+    first, second, expenses = await list_slips(employee_id=1), await list_slips(employee_id=2), await list_expenses()
+    assert (first.headers["X-Cache"], first.body) == ("MISS", b'{"employee_id":1,"calls":3}')
+    assert (second.headers["X-Cache"], second.body) == ("HIT", b'{"employee_id":2,"calls":2}')
+    assert expenses.headers["X-Cache"] == "HIT"
+
+    await cache.invalidate("salary_slips")
+
+    assert (await list_slips(employee_id=2)).headers["X-Cache"] == "MISS"
+    assert (await list_expenses()).headers["X-Cache"] == "HIT"
+
+
+def test_employee_list_reflects_deactivation(client, admin_headers, make_employee):
+    employee_id, _ = make_employee(department="Cache QA")
+    params = {"department": "Cache QA"}
+
+    assert client.get("/admin/employees", headers=admin_headers, params=params).headers["X-Cache"] == "MISS"
+    response = client.get("/admin/employees", headers=admin_headers, params=params)
+    assert response.headers["X-Cache"] == "HIT"
+    assert [row["is_active"] for row in response.json()] == [True]
+
+    client.put(f"/admin/employees/{employee_id}/deactivate", headers=admin_headers).raise_for_status()
+
+    response = client.get("/admin/employees", headers=admin_headers, params=params)
+    assert response.headers["X-Cache"] == "MISS"
+    assert [row["is_active"] for row in response.json()] == [False]
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import func, select
+from app.models.salary_slip import SalarySlip
+from app.schemas.salary_slip import SalarySlipCreate
+from app.services.salary_slip_service import bulk_insert_salary_slips
+from app.services.tax_engine import TaxTableNotFound, get_tax_table, monthly_tax
+
+
+def test_years_before_the_earliest_table_are_rejected():
+    assert get_tax_table(2030).year == 2026
+    with pytest.raises(TaxTableNotFound, match="No tax table for US-FED-SINGLE in 2023"):
+        get_tax_table(2023)
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_reports_untaxable_rows_per_row(db, employee_id):
+    slips = [
+        SalarySlipCreate(employee_id=employee_id, month=1, year=2024, basic_salary=5000),
+        SalarySlipCreate(employee_id=employee_id, month=2, year=2023, basic_salary=5000),
+        SalarySlipCreate(employee_id=employee_id, month=3, year=2023, basic_salary=5000, tax=250),
+        SalarySlipCreate(employee_id=999999, month=4, year=2023, basic_salary=5000),
+        SalarySlipCreate(employee_id=employee_id, month=5, year=2025, basic_salary=5000),
+    ]
+    before = await db.scalar(select(func.count()).select_from(SalarySlip))
+
+    created, errors = await bulk_insert_salary_slips(db, slips)
+    await db.commit()
+
+    assert [(slip.year, slip.month) for slip in created] == [(2024, 1), (2023, 3), (2025, 5)]
+    assert [slip.tax for slip in created] == [monthly_tax(5000, 2024), 250, monthly_tax(5000, 2025)]
+    assert errors == [
+        {"index": 1, "employee_id": employee_id, "detail": "No tax table for US-FED-SINGLE in 2023"},
+        {"index": 3, "employee_id": 999999, "detail": "Employee not found"},
+    ]
+    assert await db.scalar(select(func.count()).select_from(SalarySlip)) == before + 3
+
+
+def test_editing_pay_recomputes_derived_tax_only(client, admin_headers, make_employee):
+    employee_id, _ = make_employee()
+    derived, manual = (
+        client.post("/admin/salary-slip", headers=admin_headers, json={
+            "employee_id": employee_id, "month": month, "year": 2025, "basic_salary": 5000, **extra,
+        }).json()
+        for month, extra in ((1, {}), (2, {"tax": 123.45}))
+    )
+    assert derived["tax"] == monthly_tax(5000, 2025)
+
+    derived = client.put(f"/admin/salary-slip/{derived['id']}", headers=admin_headers, json={"basic_salary": 8000}).json()
+    assert derived["tax"] == monthly_tax(8000, 2025)
+    assert derived["net_salary"] == round(8000 - monthly_tax(8000, 2025), 2)
+
+    manual = client.put(f"/admin/salary-slip/{manual['id']}", headers=admin_headers, json={"basic_salary": 8000}).json()
+    assert manual["tax"] == 123.45
+
+    response = client.put(f"/admin/salary-slip/{derived['id']}", headers=admin_headers, json={"year": 2023})
+    assert response.status_code == 400
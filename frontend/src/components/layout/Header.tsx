@@ -3,14 +3,80 @@ import { useTheme } from '../../contexts/ThemeContext'
 import { Bell, Moon, Sun, LogOut, User } from 'lucide-react'
 import { Button } from '../ui/button'
 import { useNavigate } from 'react-router-dom'
-import { useState } from 'react'
-import NotificationCenter from './NotificationCenter'
+import { useEffect, useState } from 'react'
+import { useQuery, useQueryClient } from '@tanstack/react-query'
+import api, { API_URL } from '../../services/api'
+import NotificationCenter, { type Notification } from './NotificationCenter'
+
+const STREAM_RETRY_MS = 5000
 
 export default function Header() {
   const { user, logout } = useAuth()
   const { theme, toggleTheme } = useTheme()
   const navigate = useNavigate()
+  const queryClient = useQueryClient()
   const [showNotifications, setShowNotifications] = useState(false)
+  const { data: unreadCount = 0 } = useQuery<number>({
+    queryKey: ['notifications-unread-count'],
+    queryFn: async () => {
+      const response = await api.get('/employee/notifications/unread-count')
+      return response.data.unread_count
+    },
+    enabled: !!user,
+  })
+
+  // New notifications are pushed over Server-Sent Events for as long as the
+  // header is mounted, so the badge stays current with the panel closed.
+  // Streams open with a single-use ticket rather than the access token, so
+  // every reconnect fetches a new one and resumes after the last event seen.
+  useEffect(() => {
+    if (!user) return
+
+    let source: EventSource | null = null
+    let retry: ReturnType<typeof setTimeout> | undefined
+    let lastEventId = ''
+    let stopped = false
+
+    const reconnect = () => {
+      source?.close()
+      if (!stopped) retry = setTimeout(connect, STREAM_RETRY_MS)
+    }
+
+    async function connect() {
+      let ticket: string
+      try {
+        const response = await api.post('/employee/notifications/stream-ticket')
+        ticket = response.data.ticket
+      } catch {
+        reconnect()
+        return
+      }
+      if (stopped) return
+
+      const params = new URLSearchParams({ ticket })
+      if (lastEventId) params.set('last_event_id', lastEventId)
+      const stream = new EventSource(`${API_URL}/employee/notifications/stream?${params}`)
+      stream.addEventListener('notification', (event) => {
+        const message = event as MessageEvent
+        lastEventId = message.lastEventId
+        const notification: Notification = JSON.parse(message.data)
+        queryClient.setQueryData<Notification[]>(['notifications'], (current) =>
+          current && [notification, ...current.filter((n) => n.id !== notification.id)].slice(0, 10)
+        )
+        queryClient.setQueryData<number>(['notifications-unread-count'], (count = 0) => count + 1)
+      })
+      // The ticket is spent, so EventSource's own retry would be rejected.
+      stream.onerror = reconnect
+      source = stream
+    }
+
+    connect()
+    return () => {
+      stopped = true
+      clearTimeout(retry)
+      source?.close()
+    }
+  }, [user, queryClient])
 
   const handleLogout = () => {
     logout()
@@ -34,7 +100,11 @@ export default function Header() {
             className="relative"
           >
             <Bell className="h-5 w-5" />
-            {/* Notification badge would go here */}
+            {unreadCount > 0 && (
+              <span className="absolute -top-1 -right-1 min-w-[1.25rem] h-5 px-1 rounded-full bg-destructive text-destructive-foreground text-xs flex items-center justify-center">
+                {unreadCount > 99 ? '99+' : unreadCount}
+              </span>
+            )}
           </Button>
           {showNotifications && (
             <NotificationCenter onClose={() => setShowNotifications(false)} />
@@ -1,5 +1,4 @@
-import { useEffect, useState } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useQuery, useQueryClient } from '@tanstack/react-query'
 import api from '../../services/api'
 import { Bell, X } from 'lucide-react'
 import { Button } from '../ui/button'
@@ -7,7 +6,7 @@ import { Card } from '../ui/card'
 import { Badge } from '../ui/badge'
 import { formatDistanceToNow } from 'date-fns'
 
-interface Notification {
+export interface Notification {
   id: number
   type: string
   title: string
@@ -18,6 +17,7 @@ interface Notification {
 }
 
 export default function NotificationCenter({ onClose }: { onClose: () => void }) {
+  const queryClient = useQueryClient()
   const { data: notifications = [], refetch } = useQuery<Notification[]>({
     queryKey: ['notifications'],
     queryFn: async () => {
@@ -28,6 +28,13 @@ export default function NotificationCenter({ onClose }: { onClose: () => void })
 
   const markAsRead = async (id: number) => {
     await api.put(`/employee/notifications/${id}/read`)
+    queryClient.invalidateQueries({ queryKey: ['notifications-unread-count'] })
+    refetch()
+  }
+
+  const markAllAsRead = async () => {
+    const response = await api.put('/employee/notifications/read-all')
+    queryClient.setQueryData(['notifications-unread-count'], response.data.unread_count)
     refetch()
   }
 
@@ -45,9 +52,16 @@ export default function NotificationCenter({ onClose }: { onClose: () => void })
             </Badge>
           )}
         </div>
-        <Button variant="ghost" size="icon" onClick={onClose}>
-          <X className="h-4 w-4" />
-        </Button>
+        <div className="flex items-center gap-1">
+          {unreadCount > 0 && (
+            <Button variant="ghost" size="sm" onClick={markAllAsRead}>
+              Mark all read
+            </Button>
+          )}
+          <Button variant="ghost" size="icon" onClick={onClose}>
+            <X className="h-4 w-4" />
+          </Button>
+        </div>
       </div>
 
       <div className="divide-y">
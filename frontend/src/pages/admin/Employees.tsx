@@ -37,8 +37,14 @@ export default function AdminEmployees() {
   const { data: employees = [], isLoading } = useQuery<Employee[]>({
     queryKey: ['admin-employees', search],
     queryFn: async () => {
-      const response = await api.get(`/admin/employees?search=${search}`)
-      return response.data
+      const query = search.trim()
+      if (!query) {
+        const response = await api.get('/admin/employees')
+        return response.data
+      }
+      // The ranked search tolerates typos; the list filter only matches exactly.
+      const response = await api.get('/admin/employees/search', { params: { q: query, limit: 100 } })
+      return response.data.results.map((hit: { employee: Employee }) => hit.employee)
     },
   })
 
@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import api from '../../services/api'
+import api, { API_URL } from '../../services/api'
 import { Card, CardContent, CardHeader, CardTitle } from '../../components/ui/card'
 import { Button } from '../../components/ui/button'
 import { Input } from '../../components/ui/input'
@@ -18,12 +18,19 @@ interface Expense {
   expense_date: string
   status: 'pending' | 'approved' | 'rejected'
   admin_comment?: string
+  receipt_url?: string
   employee?: {
     full_name: string
     email: string
   }
 }
 
+const IMAGE_RECEIPT = /\.(png|jpe?g)$/i
+
+// Receipts are served through /files/, which can downscale images (legacy URLs used /uploads/).
+const receiptFileUrl = (receiptUrl: string) =>
+  `${API_URL}${receiptUrl.replace(/^\/uploads\//, '/files/')}`
+
 export default function AdminExpenses() {
   const [search, setSearch] = useState('')
   const queryClient = useQueryClient()
@@ -31,7 +38,7 @@ export default function AdminExpenses() {
   const { data: expenses = [], isLoading } = useQuery<Expense[]>({
     queryKey: ['admin-expenses'],
     queryFn: async () => {
-      const response = await api.get('/admin/expenses')
+      const response = await api.get('/admin/expenses', { params: { include: 'employee' } })
       return response.data
     },
   })
@@ -121,6 +128,20 @@ export default function AdminExpenses() {
                 >
                   <div className="flex-1">
                     <div className="flex items-center gap-4">
+                      {expense.receipt_url && IMAGE_RECEIPT.test(expense.receipt_url) && (
+                        <a
+                          href={`${receiptFileUrl(expense.receipt_url)}?size=preview`}
+                          target="_blank"
+                          rel="noopener noreferrer"
+                        >
+                          <img
+                            src={`${receiptFileUrl(expense.receipt_url)}?size=thumb`}
+                            alt="Receipt"
+                            loading="lazy"
+                            className="w-16 h-16 rounded object-cover border"
+                          />
+                        </a>
+                      )}
                       <div>
                         <p className="font-medium">
                           {expense.employee?.full_name || `Employee #${expense.employee_id}`}
@@ -44,7 +44,7 @@ export default function AdminSalarySlips() {
   const { data: salarySlips = [], isLoading } = useQuery<SalarySlip[]>({
     queryKey: ['admin-salary-slips'],
     queryFn: async () => {
-      const response = await api.get('/admin/salary-slips')
+      const response = await api.get('/admin/salary-slips', { params: { include: 'employee' } })
       return response.data
     },
   })
@@ -69,7 +69,8 @@ export default function AdminSalarySlips() {
         basic_salary: Number(form.basic_salary),
         allowances: Number(form.allowances || 0),
         deductions: Number(form.deductions || 0),
-        tax: Number(form.tax || 0),
+        // Left blank, tax is computed from the tax brackets
+        tax: form.tax === '' ? null : Number(form.tax),
       }
       await api.post('/admin/salary-slip', payload)
     },
@@ -196,7 +197,7 @@ export default function AdminSalarySlips() {
                 <Input
                   value={form.tax}
                   onChange={(e) => setForm({ ...form, tax: e.target.value })}
-                  placeholder="0.00"
+                  placeholder="Auto"
                 />
               </div>
             </div>